@@ -1,16 +1,34 @@
 import os
+import io
 import sys
+import gzip
+import json
+import gc
+import math
+import ctypes
 import random
 import time
+import threading
+import queue
+import collections
+import weakref
 import numpy as np
 import tkinter as tk
 from tkinter import ttk
 import pygame
 import csv
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from pygame._sdl2 import video as sdl2_video
+except ImportError:
+    sdl2_video = None  # The texture renderer needs pygame 2 with SDL2 support
 
 def start_game():
     global difficulty_level, subject, session, hand, max_rounds, block, movement, total_blocks, current_block, paused, study_id, initial_window_size
-    global font_large_size, movement_speed, words_per_level, use_advanced_settings
+    global font_large_size, movement_speed, words_per_level, use_advanced_settings, use_dirty_rects
+    global refresh_rate_setting, use_vsync, target_fps, real_time_mode, renderer_backend, session_seed, cursor_sampling_rate
+    global trajectory_format
     
     # Get the values from the GUI entries
     subject = subject_entry.get()
@@ -20,6 +38,15 @@ def start_game():
     max_rounds = int(max_rounds_entry.get())
     movement = move_targets_var.get()
     study_id = study_id_entry.get()
+    use_dirty_rects = dirty_rects_var.get()
+    refresh_rate_setting = refresh_rate_combo.get()
+    use_vsync = vsync_var.get()
+    real_time_mode = real_time_var.get()
+    renderer_backend = renderer_combo.get()
+    trajectory_format = trajectory_format_combo.get()
+    if renderer_backend == "SDL2 Texture" and sdl2_video is None:
+        print("The SDL2 texture renderer is not available in this pygame build. Using software rendering.")
+        renderer_backend = "Software"
     current_block = 1  # Start with the first block
     block = str(current_block)  # Set the initial block number
     paused = False  # Resume the game
@@ -48,10 +75,44 @@ def start_game():
         words_per_level = {1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7, 8: 8, 9: 9, 10: 10, 11: 11, 12: 12, 13: 13, 14: 14, 15: 15}
         use_advanced_settings = False  # Flag to indicate default difficulty settings are in use
 
+    if refresh_rate_setting != "Native":
+        try:
+            target_fps = int(refresh_rate_setting)
+        except ValueError:
+            print("Invalid refresh rate. Please select a refresh rate in Hz or 'Native'.")
+            return
+
+    cursor_sampling_setting = cursor_sampling_combo.get()
+    if cursor_sampling_setting == "Off":
+        cursor_sampling_rate = 0
+    else:
+        try:
+            cursor_sampling_rate = int(cursor_sampling_setting)
+        except ValueError:
+            cursor_sampling_rate = 0
+        if cursor_sampling_rate <= 0:
+            print("Invalid cursor sampling rate. Please select a rate in Hz or 'Off'.")
+            return
+
+    # A blank seed draws a fresh one; it is saved with the results either way
+    seed_text = seed_entry.get().strip()
+    if seed_text:
+        try:
+            session_seed = int(seed_text)
+        except ValueError:
+            session_seed = -1
+        if session_seed < 0:
+            print("Invalid random seed. Please enter a non-negative integer or leave it blank.")
+            return
+    else:
+        session_seed = random.SystemRandom().randrange(2 ** 32)
+
     # Initialize Pygame and set the initial window size
     pygame.init()
     screen_info = pygame.display.Info()
     initial_window_size = (screen_info.current_w - 300, screen_info.current_h - 300)
+    if refresh_rate_setting == "Native":
+        target_fps = get_native_refresh_rate()
     
     reset_game_state()
 
@@ -59,9 +120,208 @@ def start_game():
     root.quit()
     root.destroy()
 
+def get_native_refresh_rate():
+    # Refresh rate of the main display's current mode, read from the OS since
+    # pygame 2 has no call for it. A rate of 0 or 1 means the driver does not
+    # report one (common on built-in laptop panels).
+    refresh_rate = 0
+    try:
+        if sys.platform == 'win32':
+            class DEVMODEW(ctypes.Structure):
+                _fields_ = [('dmDeviceName', ctypes.c_wchar * 32), ('dmSpecVersion', ctypes.c_ushort),
+                            ('dmDriverVersion', ctypes.c_ushort), ('dmSize', ctypes.c_ushort),
+                            ('dmDriverExtra', ctypes.c_ushort), ('dmFields', ctypes.c_ulong),
+                            ('dmPositionX', ctypes.c_long), ('dmPositionY', ctypes.c_long),
+                            ('dmDisplayOrientation', ctypes.c_ulong), ('dmDisplayFixedOutput', ctypes.c_ulong),
+                            ('dmColor', ctypes.c_short), ('dmDuplex', ctypes.c_short),
+                            ('dmYResolution', ctypes.c_short), ('dmTTOption', ctypes.c_short),
+                            ('dmCollate', ctypes.c_short), ('dmFormName', ctypes.c_wchar * 32),
+                            ('dmLogPixels', ctypes.c_ushort), ('dmBitsPerPel', ctypes.c_ulong),
+                            ('dmPelsWidth', ctypes.c_ulong), ('dmPelsHeight', ctypes.c_ulong),
+                            ('dmDisplayFlags', ctypes.c_ulong), ('dmDisplayFrequency', ctypes.c_ulong),
+                            ('dmICMMethod', ctypes.c_ulong), ('dmICMIntent', ctypes.c_ulong),
+                            ('dmMediaType', ctypes.c_ulong), ('dmDitherType', ctypes.c_ulong),
+                            ('dmReserved1', ctypes.c_ulong), ('dmReserved2', ctypes.c_ulong),
+                            ('dmPanningWidth', ctypes.c_ulong), ('dmPanningHeight', ctypes.c_ulong)]
+            ENUM_CURRENT_SETTINGS = 0xFFFFFFFF
+            devmode = DEVMODEW()
+            devmode.dmSize = ctypes.sizeof(DEVMODEW)
+            if ctypes.windll.user32.EnumDisplaySettingsW(None, ENUM_CURRENT_SETTINGS, ctypes.byref(devmode)):
+                refresh_rate = devmode.dmDisplayFrequency
+        elif sys.platform == 'darwin':
+            quartz = ctypes.cdll.LoadLibrary('/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices')
+            quartz.CGMainDisplayID.restype = ctypes.c_uint32
+            quartz.CGDisplayCopyDisplayMode.restype = ctypes.c_void_p
+            quartz.CGDisplayCopyDisplayMode.argtypes = [ctypes.c_uint32]
+            quartz.CGDisplayModeGetRefreshRate.restype = ctypes.c_double
+            quartz.CGDisplayModeGetRefreshRate.argtypes = [ctypes.c_void_p]
+            quartz.CGDisplayModeRelease.argtypes = [ctypes.c_void_p]
+            mode = quartz.CGDisplayCopyDisplayMode(quartz.CGMainDisplayID())
+            if mode:
+                refresh_rate = quartz.CGDisplayModeGetRefreshRate(mode)
+                quartz.CGDisplayModeRelease(mode)
+    except (OSError, AttributeError):
+        pass
+    if refresh_rate > 1:
+        return round(refresh_rate, 2)
+    print("Could not detect the monitor refresh rate. Using 60 Hz.")
+    return 60
+
+def open_texture_window(size):
+    global window, renderer, vsync_active, renderer_description
+    if window is not None:
+        window.size = size
+        return
+    window = sdl2_video.Window('Game: Cognitive-Motor', size=size, resizable=True)
+    try:
+        renderer = sdl2_video.Renderer(window, accelerated=1, vsync=use_vsync)
+        vsync_active = use_vsync
+        renderer_description = "SDL2 Texture (accelerated)"
+    except sdl2_video.error:
+        # No GPU available, fall back to SDL's software renderer
+        renderer = sdl2_video.Renderer(window, accelerated=0)
+        vsync_active = False
+        renderer_description = "SDL2 Texture (software)"
+    print(f"Renderer: {renderer_description}")
+
+def set_display_mode(size):
+    global vsync_active
+    if renderer_backend == "SDL2 Texture":
+        # Drawing goes through the texture renderer, there is no display surface
+        open_texture_window(size)
+        return None
+    if use_vsync:
+        # pygame only honours vsync for renderer-backed (SCALED) display surfaces
+        try:
+            display = pygame.display.set_mode(size, pygame.RESIZABLE | pygame.SCALED, vsync=1)
+            vsync_active = True
+            return display
+        except pygame.error:
+            print("VSync is not available on this display. Falling back to busy-loop frame pacing.")
+    vsync_active = False
+    return pygame.display.set_mode(size, pygame.RESIZABLE)
+
+def raise_process_priority():
+    # Returns a description of the outcome for the results file
+    if sys.platform == 'win32':
+        HIGH_PRIORITY_CLASS = 0x00000080
+        kernel32 = ctypes.windll.kernel32
+        if kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), HIGH_PRIORITY_CLASS):
+            return "High (HIGH_PRIORITY_CLASS)"
+        return "Unchanged (SetPriorityClass failed)"
+    try:
+        os.nice(-10)
+        return "Raised (nice -10)"
+    except (OSError, AttributeError):
+        return "Unchanged (insufficient permissions)"
+
+def get_cursor_reader():
+    # Returns functions reading the cursor position and the left button state
+    # (None where unavailable) and a description of them. The OS readers return
+    # screen coordinates and keep updating while the game loop is busy;
+    # pygame's position only changes when events are pumped.
+    try:
+        if sys.platform == 'win32':
+            VK_LBUTTON = 0x01
+            user32 = ctypes.windll.user32
+            point = (ctypes.c_long * 2)()
+            def read_cursor():
+                user32.GetCursorPos(point)
+                return point[0], point[1]
+            def read_button():
+                return bool(user32.GetAsyncKeyState(VK_LBUTTON) & 0x8000)
+            return read_cursor, read_button, "GetCursorPos", True
+        if sys.platform == 'darwin':
+            class CGPoint(ctypes.Structure):
+                _fields_ = [('x', ctypes.c_double), ('y', ctypes.c_double)]
+            quartz = ctypes.cdll.LoadLibrary('/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices')
+            core_foundation = ctypes.cdll.LoadLibrary('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+            quartz.CGEventCreate.restype = ctypes.c_void_p
+            quartz.CGEventCreate.argtypes = [ctypes.c_void_p]
+            quartz.CGEventGetLocation.restype = CGPoint
+            quartz.CGEventGetLocation.argtypes = [ctypes.c_void_p]
+            core_foundation.CFRelease.argtypes = [ctypes.c_void_p]
+            quartz.CGEventSourceButtonState.restype = ctypes.c_bool
+            quartz.CGEventSourceButtonState.argtypes = [ctypes.c_int32, ctypes.c_uint32]
+            kCGEventSourceStateCombinedSessionState = 0
+            kCGMouseButtonLeft = 0
+            def read_cursor():
+                event = quartz.CGEventCreate(None)
+                location = quartz.CGEventGetLocation(event)
+                core_foundation.CFRelease(event)
+                return location.x, location.y
+            def read_button():
+                return quartz.CGEventSourceButtonState(kCGEventSourceStateCombinedSessionState, kCGMouseButtonLeft)
+            return read_cursor, read_button, "Quartz CGEventGetLocation", True
+    except (OSError, AttributeError):
+        print("Could not access the system cursor position. Sampling pygame's cursor position instead.")
+    return pygame.mouse.get_pos, None, "pygame.mouse.get_pos", False
+
+def get_window_origin():
+    # Top-left corner of the window on the desktop, to turn screen coordinates into window coordinates
+    if renderer is not None:
+        return window.position
+    if sdl2_video is not None:
+        try:
+            return sdl2_video.Window.from_display_module().position
+        except Exception:
+            pass
+    return (0, 0)
+
+def set_gc_paused(pause):
+    # Garbage collection is frozen while a round is running and caught up
+    # between rounds, so a collection never lands mid-trial
+    if pause:
+        gc.disable()
+        gc.freeze()
+    else:
+        gc.unfreeze()
+        gc.enable()
+        gc.collect()
+
+def get_window_size():
+    if renderer is not None:
+        return window.size
+    return screen.get_size()
+
+def get_texture(surface):
+    # Textures are uploaded once per cached surface and released with it
+    texture = texture_cache.get(surface)
+    if texture is None:
+        texture = sdl2_video.Texture.from_surface(renderer, surface)
+        texture_cache[surface] = texture
+    return texture
+
+def draw_surface(surface, position):
+    # position is a top-left point or a Rect
+    if renderer is not None:
+        get_texture(surface).draw(dstrect=(position[0], position[1], surface.get_width(), surface.get_height()))
+    else:
+        screen.blit(surface, position)
+
+def present_frame(dirty_rects=None):
+    if renderer is not None:
+        renderer.present()
+    elif dirty_rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(dirty_rects)
+
+def get_font(size):
+    # Fonts are created once per size and reused across blocks
+    if size not in font_cache:
+        font_cache[size] = pygame.font.Font(None, size)
+    return font_cache[size]
+
+def get_large_font_size():
+    if use_advanced_settings:
+        return font_large_size[1]
+    return font_large_size[difficulty_level]
+
 def reset_game_state():
     global screen, font_large, font_small, current_round, correct_responses, incorrect_responses, missed_targets, block_complete
     global initial_window_size  # Ensure initial_window_size is accessible
+    global block_frame_count, block_frame_time
 
     # Reset game state variables
     current_round = 0
@@ -69,22 +329,23 @@ def reset_game_state():
     incorrect_responses = 0
     missed_targets = 0
     block_complete = False
+    block_frame_count = 0
+    block_frame_time = 0
 
     # Reinitialize pygame display with the previous window size
     pygame.display.init()
     pygame.font.init()
-    screen = pygame.display.set_mode(initial_window_size, pygame.RESIZABLE)
+    screen = set_display_mode(initial_window_size)
     pygame.display.set_caption('Game: Cognitive-Motor')
 
-    font_small = pygame.font.Font(None, 24)
-    if use_advanced_settings:
-        font_large = pygame.font.Font(None, font_large_size[1])
-    else:
-        font_large = pygame.font.Font(None, font_large_size[difficulty_level])
+    font_small = get_font(24)
+    font_large = get_font(get_large_font_size())
 
 def open_input_gui(subject="", session="", total_blocks="", hand="", max_rounds="", difficulty_level="", movement=True, study_id=""):
     global difficulty_var, subject_entry, session_entry, total_blocks_entry, hand_entry, max_rounds_entry
     global move_targets_var, root, study_id_entry, advanced_control_var, font_size_combo, speed_combo, num_targets_entry, difficulty_combo
+    global dirty_rects_var, refresh_rate_combo, vsync_var, real_time_var, renderer_combo, seed_entry, cursor_sampling_combo
+    global trajectory_format_combo
 
     root = tk.Tk()
     root.title("Game Settings")
@@ -177,8 +438,63 @@ def open_input_gui(subject="", session="", total_blocks="", hand="", max_rounds=
     num_targets_entry.grid(row=12, column=1, padx=5, pady=5)
     num_targets_entry.config(state="disabled")
 
+    # Dirty-rectangle rendering
+    dirty_rects_label = ttk.Label(root, text="Dirty-Rect Rendering:")
+    dirty_rects_label.grid(row=13, column=0, padx=5, pady=5)
+    dirty_rects_var = tk.BooleanVar(value=False)
+    dirty_rects_checkbutton = ttk.Checkbutton(root, text="Enable", variable=dirty_rects_var, onvalue=True, offvalue=False)
+    dirty_rects_checkbutton.grid(row=13, column=1, padx=5, pady=5)
+
+    # Frame pacing
+    refresh_rate_label = ttk.Label(root, text="Refresh Rate (Hz):")
+    refresh_rate_label.grid(row=14, column=0, padx=5, pady=5)
+    refresh_rate_combo = ttk.Combobox(root, values=["Native", 60, 120, 144, 240])
+    refresh_rate_combo.set("60")
+    refresh_rate_combo.grid(row=14, column=1, padx=5, pady=5)
+
+    vsync_label = ttk.Label(root, text="VSync:")
+    vsync_label.grid(row=15, column=0, padx=5, pady=5)
+    vsync_var = tk.BooleanVar(value=False)
+    vsync_checkbutton = ttk.Checkbutton(root, text="Enable", variable=vsync_var, onvalue=True, offvalue=False)
+    vsync_checkbutton.grid(row=15, column=1, padx=5, pady=5)
+
+    # Real-time mode (GC frozen during rounds, busy-wait pacing, raised priority)
+    real_time_label = ttk.Label(root, text="Real-Time Mode:")
+    real_time_label.grid(row=16, column=0, padx=5, pady=5)
+    real_time_var = tk.BooleanVar(value=False)
+    real_time_checkbutton = ttk.Checkbutton(root, text="Enable", variable=real_time_var, onvalue=True, offvalue=False)
+    real_time_checkbutton.grid(row=16, column=1, padx=5, pady=5)
+
+    # Rendering backend
+    renderer_label = ttk.Label(root, text="Renderer:")
+    renderer_label.grid(row=17, column=0, padx=5, pady=5)
+    renderer_combo = ttk.Combobox(root, values=["Software", "SDL2 Texture"], state="readonly")
+    renderer_combo.set("Software")
+    renderer_combo.grid(row=17, column=1, padx=5, pady=5)
+
+    # Trial schedule seed
+    seed_label = ttk.Label(root, text="Random Seed (blank = new):")
+    seed_label.grid(row=18, column=0, padx=5, pady=5)
+    seed_entry = ttk.Entry(root)
+    seed_entry.grid(row=18, column=1, padx=5, pady=5)
+
+    # Cursor sampling thread
+    cursor_sampling_label = ttk.Label(root, text="Cursor Sampling (Hz):")
+    cursor_sampling_label.grid(row=19, column=0, padx=5, pady=5)
+    cursor_sampling_combo = ttk.Combobox(root, values=["Off", 250, 500, 1000])
+    cursor_sampling_combo.set("Off")
+    cursor_sampling_combo.grid(row=19, column=1, padx=5, pady=5)
+
+    # Trajectory output: CSV files per round, one binary container per session,
+    # or compressed motion files with JSON sidecars per round
+    trajectory_format_label = ttk.Label(root, text="Trajectory Format:")
+    trajectory_format_label.grid(row=20, column=0, padx=5, pady=5)
+    trajectory_format_combo = ttk.Combobox(root, values=["CSV", "Binary", "TSV.gz"], state="readonly")
+    trajectory_format_combo.set("CSV")
+    trajectory_format_combo.grid(row=20, column=1, padx=5, pady=5)
+
     start_button = ttk.Button(root, text="Enter", command=start_game)
-    start_button.grid(row=13, columnspan=2, padx=5, pady=5)
+    start_button.grid(row=21, columnspan=2, padx=5, pady=5)
 
     root.mainloop()
 
@@ -194,20 +510,26 @@ def toggle_advanced_controls():
         num_targets_entry.config(state="disabled")
         difficulty_combo.config(state="normal")  # Enable difficulty level selection
 
+font_cache = {}  # Font objects keyed by point size
+text_surface_cache = {}  # Pre-rendered words and labels keyed by (text, color, font size)
+button_surface_cache = {}  # Pre-rendered buttons keyed by (text, color, size)
+instructions_panel_cache = {}  # Pre-rendered instructions panel keyed by font
+texture_cache = weakref.WeakKeyDictionary()  # Renderer textures keyed by their source surface
+window = None  # SDL2 window and renderer, only used by the texture backend
+renderer = None
+renderer_description = "Software"
+
 # Initialize game by opening the input GUI
 open_input_gui()
 
 pygame.init()
 screen_info = pygame.display.Info()
 width, height = screen_info.current_w, screen_info.current_h
-screen = pygame.display.set_mode((width - 300, height - 300), pygame.RESIZABLE)
+screen = set_display_mode((width - 300, height - 300))
 pygame.display.set_caption('Game: Cognitive-Motor')
 
-font_small = pygame.font.Font(None, 24)
-if use_advanced_settings:
-    font_large = pygame.font.Font(None, font_large_size[1])
-else:
-    font_large = pygame.font.Font(None, font_large_size[difficulty_level])
+font_small = get_font(24)
+font_large = get_font(get_large_font_size())
 
 # Define the colors for buttons
 button_color = (0, 200, 0)
@@ -229,7 +551,7 @@ def calculate_positions(width, height):
 
 def update_positions():
     global start_box, left_box, button_rect, word_area_start, word_area_width, width, height
-    width, height = screen.get_size()
+    width, height = get_window_size()
     start_box, left_box, button_rect, word_area_start, word_area_width = calculate_positions(width, height)
 
 # Initial calculation of positions
@@ -237,11 +559,27 @@ start_box, left_box, button_rect, word_area_start, word_area_width = calculate_p
 
 # Force an initial update of the positions and the display
 update_positions()
-pygame.display.flip()
+present_frame()
 
 colors = {'ORANGE': (255, 140, 0), 'Yellow': (255, 255, 0), 'Red': (255, 0, 0)}
 color_names = list(colors.keys())
 
+def get_text_surface(text, color, size):
+    key = (text, color, size)
+    if key not in text_surface_cache:
+        text_surface_cache[key] = get_font(size).render(text, True, color)
+    return text_surface_cache[key]
+
+def build_word_surface_cache():
+    # Render every word/color combination for every font size up front so the
+    # game loop only has to blit
+    for size in set(font_large_size.values()):
+        for word in color_names:
+            for color in colors.values():
+                get_text_surface(word, color, size)
+
+build_word_surface_cache()
+
 start_label_text = 'Start'
 congruent_label_text = 'Congruent'
 
@@ -251,33 +589,429 @@ congruent_label_surface = font_small.render(congruent_label_text, True, (255, 25
 start_label_rect = start_label_surface.get_rect(center=start_box.center)
 congruent_label_rect = congruent_label_surface.get_rect(center=left_box.center)
 
-screen.blit(font_small.render("Start", True, (255, 255, 255)), (start_box.x + 10, start_box.top + 5))
-screen.blit(font_small.render("Congruent", True, (255, 255, 255)), (left_box.x + 10, left_box.top + 5))
+draw_surface(font_small.render("Start", True, (255, 255, 255)), (start_box.x + 10, start_box.top + 5))
+draw_surface(font_small.render("Congruent", True, (255, 255, 255)), (left_box.x + 10, left_box.top + 5))
+
+def build_word_state(words):
+    # Word state is kept as parallel NumPy arrays (one entry per word) so that
+    # motion, off-screen checks and hit-testing are single vectorized steps
+    return {
+        'x': np.array([word['x'] for word in words], dtype=float),  # Sub-pixel center position
+        'y': np.array([word['y'] for word in words], dtype=float),
+        'dx': np.array([word['dx'] for word in words], dtype=float),  # Velocity in pixels per second
+        'dy': np.array([word['dy'] for word in words], dtype=float),
+        'w': np.array([word['rect'].width for word in words], dtype=int),
+        'h': np.array([word['rect'].height for word in words], dtype=int),
+        'congruent': np.array([word['congruent'] for word in words], dtype=bool),
+        'alive': np.ones(len(words), dtype=bool),
+        'original_x': np.array([word['original_position'][0] for word in words], dtype=float),
+        'original_y': np.array([word['original_position'][1] for word in words], dtype=float),
+        'surface': [word['surface'] for word in words]
+    }
+
+def get_word_rects(words):
+    # Integer top-left corners, matching pygame's Rect.center rounding
+    left = np.rint(words['x']).astype(int) - words['w'] // 2
+    top = np.rint(words['y']).astype(int) - words['h'] // 2
+    return left, top
+
+def make_spatial_grid(cell_size):
+    # Uniform grid mapping (column, row) cells to the items whose rects touch them
+    return {'cell_size': cell_size, 'cells': {}, 'rects': {}}
+
+def get_grid_cells(grid, rect):
+    cell_size = grid['cell_size']
+    for column in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+        for row in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+            yield column, row
+
+def grid_insert(grid, rect, item):
+    grid['rects'][item] = rect
+    for cell in get_grid_cells(grid, rect):
+        grid['cells'].setdefault(cell, []).append(item)
+
+def grid_query(grid, rect):
+    # Items sharing at least one cell with rect
+    found = set()
+    cells = grid['cells']
+    for cell in get_grid_cells(grid, rect):
+        if cell in cells:
+            found.update(cells[cell])
+    return found
+
+def grid_overlaps(grid, rect):
+    cells, rects = grid['cells'], grid['rects']
+    for cell in get_grid_cells(grid, rect):
+        for item in cells.get(cell, ()):
+            if rect.colliderect(rects[item]):
+                return True
+    return False
+
+def get_spawn_position(side, along, text_rect, speed):
+    # Center and velocity of a word entering from the given side, where along
+    # is its coordinate along that edge
+    if side == 'top':
+        return along, -text_rect.height // 2, 0, speed  # Start above the screen, move down
+    elif side == 'bottom':
+        return along, height + text_rect.height // 2, 0, -speed  # Start below the screen, move up
+    elif side == 'left':
+        return -text_rect.width // 2, along, speed, 0  # Start to the left of the screen, move right
+    else:
+        return width + text_rect.width // 2, along, -speed, 0  # Start to the right of the screen, move left
+
+def get_candidate_positions(text_rect, padding, speed, rng):
+    # Every valid position on a padding-sized step, shuffled
+    x_range = range(text_rect.width // 2 + padding, width - text_rect.width // 2 - padding + 1, padding)
+    y_range = range(text_rect.height // 2 + padding, height - text_rect.height // 2 - padding + 1, padding)
+    if movement:
+        candidates = [get_spawn_position(side, along, text_rect, speed)
+                      for side, along_range in (('top', x_range), ('bottom', x_range), ('left', y_range), ('right', y_range))
+                      for along in along_range]
+    else:
+        candidates = [(x, y, 0, 0) for x in x_range for y in y_range]
+    return [candidates[i] for i in rng.permutation(len(candidates))]
+
+def get_words_count():
+    if use_advanced_settings:
+        return words_per_level[1]  # Use advanced user-defined settings
+    return words_per_level[difficulty_level]
+
+def get_movement_speed():
+    if use_advanced_settings:
+        return movement_speed[1]  # Use advanced user-defined settings
+    return movement_speed[difficulty_level]
+
+def build_trial_schedule(seed):
+    # Expand the seed and the session settings into every trial of the session
+    # up front, one row per (block, round), so rounds draw nothing from the
+    # global random state and a session can be replayed from its seed
+    words_count = get_words_count()
+    trials_count = total_blocks * max_rounds
+    colors_count = len(color_names)
+    rng = np.random.default_rng(seed)
+    schedule = {
+        'block': np.repeat(np.arange(1, total_blocks + 1), max_rounds),
+        'round': np.tile(np.arange(1, max_rounds + 1), total_blocks),
+        'start_wait_time': rng.integers(2, 5, trials_count),  # Whole seconds in the start box, 2-4
+        'congruent_index': rng.integers(0, words_count, trials_count),
+        'word': rng.integers(0, colors_count, (trials_count, words_count)),  # Indices into color_names
+        # Sides and positions depend on the window size, so each trial gets its own layout seed
+        'layout_seed': rng.integers(0, 2 ** 32, trials_count)
+    }
+    # Incongruent words are drawn in any other color, the congruent word in its own
+    schedule['color'] = (schedule['word'] + rng.integers(1, colors_count, (trials_count, words_count))) % colors_count
+    congruent = np.arange(words_count) == schedule['congruent_index'][:, None]
+    schedule['color'][congruent] = schedule['word'][congruent]
+    return schedule
+
+def get_trial_index(block_number, round_number):
+    return (block_number - 1) * max_rounds + round_number - 1
+
+def get_results_directory():
+    cwd = os.getcwd()
+    results_directory = os.path.join(cwd, "rawdata", f"ID-{study_id}", f"sub-{subject}", f"ses-{session}")
+    if not os.path.exists(results_directory):
+        os.makedirs(results_directory)
+        print(f"Created directory {results_directory}")
+    return results_directory
+
+def save_trial_schedule():
+    results_directory = get_results_directory()
+
+    filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_seed-{session_seed}_schedule.csv")
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Block', 'Round', 'Start Wait Time', 'Congruent Index', 'Layout Seed', 'Words', 'Colors'])
+        for trial in range(len(trial_schedule['block'])):
+            writer.writerow([
+                trial_schedule['block'][trial], trial_schedule['round'][trial], trial_schedule['start_wait_time'][trial],
+                trial_schedule['congruent_index'][trial], trial_schedule['layout_seed'][trial],
+                ' '.join(color_names[i] for i in trial_schedule['word'][trial]),
+                ' '.join(color_names[i] for i in trial_schedule['color'][trial])
+            ])
+
+def find_word_at(words, pos, margin=20):
+    # Index of the first live word whose rect, grown by margin on every side,
+    # contains pos, or None
+    if 'grid' in words:
+        # Stationary words: only the words indexed in the cells around the
+        # click can be hit, so the bounds test runs on those alone
+        candidates = grid_query(words['grid'], pygame.Rect(pos[0] - margin, pos[1] - margin, margin * 2 + 1, margin * 2 + 1))
+        indices = np.array(sorted(candidates), dtype=int)
+    else:
+        indices = np.arange(len(words['x']))
+    x = np.rint(words['x'][indices]).astype(int)
+    y = np.rint(words['y'][indices]).astype(int)
+    w, h = words['w'][indices], words['h'][indices]
+    left, top = x - w // 2, y - h // 2
+    hits = (words['alive'][indices]
+            & (left - margin <= pos[0]) & (pos[0] < left + w + margin)
+            & (top - margin <= pos[1]) & (pos[1] < top + h + margin))
+    hits = indices[hits]
+    if len(hits) == 0:
+        return None
+    return int(hits[0])
+
+class KinematicsAccumulator:
+    # Running path length, velocity and movement onset for one round, updated
+    # per cursor position with plain float arithmetic so that high-rate mice
+    # do not allocate anything per event. Times are session clock nanoseconds.
+    __slots__ = ('onset_velocity', 'last_x', 'last_y', 'last_time', 'unclocked_distance',
+                 'path_length', 'drag_path_length', 'velocity', 'peak_velocity', 'movement_onset_time')
+
+    def __init__(self, onset_velocity):
+        self.onset_velocity = onset_velocity  # Pixels per second
+        self.reset()
+
+    def reset(self, pos=None, start_time=None):
+        self.last_x, self.last_y = pos if pos is not None else (None, None)
+        self.last_time = start_time
+        self.unclocked_distance = 0.0  # Distance moved since the last distinct timestamp
+        self.path_length = 0.0
+        self.drag_path_length = 0.0
+        self.velocity = 0.0
+        self.peak_velocity = 0.0
+        self.movement_onset_time = None
+
+    def add(self, x, y, sample_time, dragging):
+        if self.last_x is not None:
+            distance = math.hypot(x - self.last_x, y - self.last_y)
+            self.path_length += distance
+            if dragging:
+                self.drag_path_length += distance
+            self.unclocked_distance += distance
+        self.last_x, self.last_y = x, y
+        if self.last_time is None:
+            self.last_time = sample_time
+        elif sample_time > self.last_time:
+            # Events read in the same batch share a timestamp, so velocity is
+            # taken over the distance covered since the last distinct one
+            self.velocity = self.unclocked_distance * 1e9 / (sample_time - self.last_time)
+            if self.velocity > self.peak_velocity:
+                self.peak_velocity = self.velocity
+            if self.movement_onset_time is None and self.velocity >= self.onset_velocity:
+                self.movement_onset_time = sample_time
+            self.unclocked_distance = 0.0
+            self.last_time = sample_time
+
+    def movement_onset_latency(self, since):
+        # Milliseconds from since to movement onset, or None if the cursor never moved
+        if self.movement_onset_time is None or since is None:
+            return None
+        return (self.movement_onset_time - since) / 1e6
+
+class TrajectoryBuffer:
+    # (x, y, time) samples stored column-wise in preallocated NumPy arrays
+    # that double in size when full: 24 bytes per sample instead of a tuple
+    # of three Python objects. view() returns zero-copy views of the filled part.
+    __slots__ = ('x', 'y', 't', 'size')
+
+    def __init__(self, capacity=256):
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.t = np.empty(capacity, dtype=np.int64)  # Session clock nanoseconds
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def reserve(self, count):
+        # Make room for count more samples
+        if self.size + count > len(self.t):
+            capacity = max(len(self.t) * 2, self.size + count)
+            for name in ('x', 'y', 't'):
+                column = getattr(self, name)
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                setattr(self, name, grown)
+
+    def append(self, x, y, t):
+        if self.size == len(self.t):
+            self.reserve(1)
+        self.x[self.size] = x
+        self.y[self.size] = y
+        self.t[self.size] = t
+        self.size += 1
+
+    def extend(self, x, y, t):
+        count = len(t)
+        self.reserve(count)
+        self.x[self.size:self.size + count] = x
+        self.y[self.size:self.size + count] = y
+        self.t[self.size:self.size + count] = t
+        self.size += count
+
+    def view(self):
+        return self.x[:self.size], self.y[:self.size], self.t[:self.size]
+
+class TrajectoryStream:
+    # One phase of one round, written out in chunks while the round runs, so
+    # at most chunk_size samples are held in memory and a crash loses no more
+    # than the current chunk. A text row's derivatives need the samples after
+    # it, so there the samples of the newest kinematics_lookahead timestamps
+    # are held back until the next chunk or close().
+    __slots__ = ('filename', 'run', 'chunk', 'chunk_size', 'started')
+
+    def __init__(self, filename, run, chunk_size):
+        self.filename = filename
+        self.run = run  # (block, round, phase) for the binary container index
+        self.chunk = TrajectoryBuffer(chunk_size + 1)
+        self.chunk_size = chunk_size
+        self.started = False  # The file exists and has its header
+
+    def __len__(self):
+        return len(self.chunk)
+
+    def append(self, x, y, t):
+        self.chunk.append(x, y, t)
+        if len(self.chunk) > self.chunk_size:
+            self.flush()
+
+    def extend(self, x, y, t):
+        self.chunk.extend(x, y, t)
+        if len(self.chunk) > self.chunk_size:
+            self.flush()
+
+    def flush(self, final=False):
+        x, y, t = self.chunk.view()
+        rows = len(t) if final or trajectory_format == "Binary" else get_complete_rows(t)
+        if rows == 0:
+            return
+        start_box_origin = convert_to_cartesian(start_box.center, height)
+        # The subtraction and copy give the writer thread its own arrays
+        queue_trajectory_write(self.filename, self.run, x - start_box_origin[0], y - start_box_origin[1], t.copy(),
+                               get_box_geometry(start_box_origin), append=self.started, final=final)
+        self.started = True
+        held_back = len(t) - rows
+        if held_back:
+            x, y, t = x[rows:].copy(), y[rows:].copy(), t[rows:].copy()
+        self.chunk.size = 0
+        if held_back:
+            self.chunk.extend(x, y, t)
+
+    def close(self):
+        self.flush(final=True)
+
+# Session clock: every recorded time is an integer count of nanoseconds since
+# session_start_ns on the monotonic perf_counter_ns() clock. The wall-clock
+# time of that instant is written once, in the results header.
+session_start_ns = time.perf_counter_ns()
+session_start_wall_time = time.time()
+
+def session_time_ns():
+    return time.perf_counter_ns() - session_start_ns
 
 waiting = False
 start_time = None
 target_words_appear_time = None  # New variable to track target words appearance time
-
-clock = pygame.time.Clock()
-fps = 60
-
-current_words = []
+onset_pending = False  # The words of a new round are drawn but not yet presented
+
+fps = target_fps
+# Frames are paced by the vertical blank when vsync is available, with the
+# deadline below still capping the rate should the driver ignore vsync.
+# Otherwise busy-wait for high refresh rates, where sleep granularity is too
+# coarse.
+if vsync_active:
+    frame_pacing = 'vsync'
+elif use_vsync or real_time_mode or fps > 60:
+    frame_pacing = 'busy-loop'
+else:
+    frame_pacing = 'sleep'
+# Frames are paced against perf_counter deadlines exactly
+# 1/fps apart; Clock.tick() works in whole milliseconds, which turns 144 Hz
+# into 167 fps
+frame_interval = 1 / fps
+next_frame_deadline = time.perf_counter()
+busy_wait_margin = 0.002  # Seconds before a deadline at which sleep pacing stops sleeping and spins
+event_poll_interval = 0.001  # Seconds between reads of the event queue while waiting for a frame
+
+def collect_events():
+    # Reads the event queue during the frame wait and stamps each event with
+    # the session time it was read, so input arriving while the loop waits is
+    # dated to within event_poll_interval instead of to the next frame
+    events = pygame.event.get()
+    if events:
+        arrival_time = session_time_ns()
+        for event in events:
+            event.arrival_time = arrival_time
+        arrived_events.extend(events)
+
+def wait_for_next_frame():
+    global next_frame_deadline
+    next_frame_deadline += frame_interval
+    now = time.perf_counter()
+    if next_frame_deadline <= now:
+        # The frame ran late. A small slip is absorbed by the next frames;
+        # after a whole missed frame the schedule restarts from now rather
+        # than rushing several frames to catch up.
+        if now - next_frame_deadline > frame_interval:
+            next_frame_deadline = now
+        return
+    if frame_pacing != 'busy-loop' or cursor_sampler is not None:
+        # Sleep most of the way in slices, reading the event queue between
+        # them. With the sampler running this is needed even for busy-loop
+        # pacing: a plain spin holds the GIL and starves the sampler thread.
+        while next_frame_deadline - now > busy_wait_margin:
+            time.sleep(min(event_poll_interval, next_frame_deadline - now - busy_wait_margin))
+            collect_events()
+            now = time.perf_counter()
+    next_poll = now
+    while now < next_frame_deadline:
+        if now >= next_poll:
+            collect_events()
+            next_poll = now + event_poll_interval
+        if cursor_sampler is not None:
+            time.sleep(0)  # Releases the GIL to the sampler
+        now = time.perf_counter()
+
+process_priority = "Unchanged"
+gc_paused = False
+if real_time_mode:
+    process_priority = raise_process_priority()
+    print(f"Real-time mode enabled. Process priority: {process_priority}")
+speed_reference_fps = 60  # movement_speed values are pixels per frame at this frame rate
+last_frame_time = time.perf_counter()
+idle_timeout = 250  # Milliseconds to sleep between redraws while idle
+
+current_words = build_word_state([])
+layout_executor = ThreadPoolExecutor(max_workers=1)
+persistence_queue = queue.Queue(maxsize=64)  # File writes waiting for the writer thread
+next_words = None  # (future, window size, trial) of the layout prepared for the next round
+cursor_sampler = None
+cursor_sampling_description = "Mouse motion events"
+cursor_sampling_stats = {}  # Sampler rate and jitter keyed by (block, round)
+cursor_button_transitions = None
+cursor_start_box_exit_time = None  # Session time the sampler first saw the cursor outside the start box this round
+event_capture_time = None  # When the current batch of events was read from the queue
+arrived_events = []  # Events read during the last frame wait, stamped with arrival_time
+event_capture_ticks = None
+max_button_transition_age = 250_000_000  # Nanoseconds
+input_timing_source = "Event read time (event queue read every 1 ms while waiting for a frame)"
+trial_schedule = build_trial_schedule(session_seed)
+save_trial_schedule()
+print(f"Trial schedule generated with seed {session_seed}")
 start_phase_coords = []
 target_phase_coords = []
 current_round = 0
 in_round = False
-selected_word = None
+selected_word = None  # Index into current_words of the word being dragged
+selected_word_start_time = None
 dragging = False
-path_length = 0
-path_length_outside_target = 0
-last_mouse_pos = None
+movement_onset_velocity = 50  # Pixels per second the cursor must reach to count as moving
+round_kinematics = KinematicsAccumulator(movement_onset_velocity)
 correct_responses = 0
 incorrect_responses = 0
 missed_targets = 0
 mouse_left_start_time = None
 reaction_times = {'congruent_correct': [], 'congruent_incorrect': [], 'incongruent_correct': [], 'incongruent_incorrect': []}
-round_coordinates = {'start_phase_coords': {}, 'target_phase_coords': {}}
-congruent_word_coords = {}
+round_coordinates = {'start_phase_coords': {}, 'target_phase_coords': {}}  # Streams of the rounds in progress, keyed by round
+phase_file_suffixes = {'start_phase_coords': 'phase-start', 'target_phase_coords': 'phase-deliver'}
+trajectory_chunk_size = 1024  # Samples held per stream before they are appended to disk
+kinematics_lookahead = 3  # Following timestamps needed for a row's velocity, acceleration and jerk
+trajectory_container_size = None  # Bytes in this session's binary container, None until this launch first writes to it
+open_motion_files = {}  # Compressed motion files of the rounds in progress, used by the writer thread only
+finished_trajectory_files = set()  # Files of the current block whose round has ended
+congruent_word_segments = {}  # Straight-line trajectory segments of each round's congruent word, current block only
 reaction_time_to_target = []
 reaction_time_from_start = 0
 mouse_left_target_time = None
@@ -291,205 +1025,552 @@ click_threshold = 50
 dwell_time_from_appearance_to_start = []  # Use a list for multiple rounds
 block_complete = False
 
-def create_stroop_words():
-    global target_words_appear_time  # Declare it global to modify the value
-    
-    if use_advanced_settings:
-        words_count = words_per_level[1]  # Use advanced user-defined settings
-        speed = movement_speed[1]
-    else:
-        words_count = words_per_level[difficulty_level]
-        speed = movement_speed[difficulty_level]
+def create_stroop_words(trial):
+    speed = get_movement_speed() * speed_reference_fps  # Convert to pixels per second
 
-    congruent_index = random.randint(0, words_count - 1)
+    words_count = get_words_count()
+    congruent_index = trial_schedule['congruent_index'][trial]
+    rng = np.random.default_rng(trial_schedule['layout_seed'][trial])  # Sides and positions for this trial
     words = []
 
     padding = 20  # Define the minimum distance between words
-    max_attempts = 100  # Maximum attempts to place a word without overlap
+    max_attempts = 100  # Random attempts to place a word before scanning for a free position
+
+    # Grid cells as large as the widest padded word, so that each overlap
+    # check only looks at the few words in neighbouring cells
+    font_size = get_large_font_size()
+    cell_size = max(max(get_text_surface(name, colors[name], font_size).get_size()) for name in color_names) + padding * 2
+    word_grid = make_spatial_grid(cell_size)
+    unplaceable_size = None  # Smallest word size a full scan found no room for
 
     for i in range(words_count):
-        if i == congruent_index:
-            word = color = random.choice(color_names)
-        else:
-            word, color = random.sample(color_names, 2)
+        word = color_names[trial_schedule['word'][trial][i]]
+        color = color_names[trial_schedule['color'][trial][i]]
 
-        text_surface = font_large.render(word, True, colors[color])
+        text_surface = get_text_surface(word, colors[color], font_size)
         text_rect = text_surface.get_rect()
 
-        dx, dy = 0, 0  # Ensure movement is either horizontal or vertical
+        dx, dy = 0, 0  # Velocity in pixels per second, either horizontal or vertical
         placed_successfully = False
+        # Skip words that cannot fit where a smaller one already could not
+        fits = unplaceable_size is None or text_rect.width < unplaceable_size[0] or text_rect.height < unplaceable_size[1]
 
-        for attempt in range(max_attempts):
+        for attempt in range(max_attempts if fits else 0):
             if movement:  # If movement is enabled, assign dx, dy based on a random side
                 sides = ['top', 'bottom', 'left', 'right']
-                side = random.choice(sides)
-                if side == 'top':
-                    x = random.randint(text_rect.width // 2 + padding, width - text_rect.width // 2 - padding)
-                    y = -text_rect.height // 2  # Start above the screen
-                    dx = 0  # No horizontal movement
-                    dy = speed  # Move down
-                elif side == 'bottom':
-                    x = random.randint(text_rect.width // 2 + padding, width - text_rect.width // 2 - padding)
-                    y = height + text_rect.height // 2  # Start below the screen
-                    dx = 0  # No horizontal movement
-                    dy = -speed  # Move up
-                elif side == 'left':
-                    x = -text_rect.width // 2  # Start to the left of the screen
-                    y = random.randint(text_rect.height // 2 + padding, height - text_rect.height // 2 - padding)
-                    dx = speed  # Move right
-                    dy = 0  # No vertical movement
-                elif side == 'right':
-                    x = width + text_rect.width // 2  # Start to the right of the screen
-                    y = random.randint(text_rect.height // 2 + padding, height - text_rect.height // 2 - padding)
-                    dx = -speed  # Move left
-                    dy = 0  # No vertical movement
-
-                text_rect.center = (x, y)
+                side = sides[rng.integers(len(sides))]
+                if side in ('top', 'bottom'):
+                    along = int(rng.integers(text_rect.width // 2 + padding, width - text_rect.width // 2 - padding + 1))
+                else:
+                    along = int(rng.integers(text_rect.height // 2 + padding, height - text_rect.height // 2 - padding + 1))
+                x, y, dx, dy = get_spawn_position(side, along, text_rect, speed)
             else:  # Random position if movement is not enabled
-                x = random.randint(text_rect.width // 2 + padding, width - text_rect.width // 2 - padding)
-                y = random.randint(text_rect.height // 2 + padding, height - text_rect.height // 2 - padding)
-                text_rect.center = (x, y)
-
-            # Check for overlap with existing words considering the padding
-            overlap = False
-            for existing_word in words:
-                expanded_rect = existing_word['rect'].inflate(padding * 2, padding * 2)
-                if text_rect.colliderect(expanded_rect):
-                    overlap = True
-                    break
+                x = int(rng.integers(text_rect.width // 2 + padding, width - text_rect.width // 2 - padding + 1))
+                y = int(rng.integers(text_rect.height // 2 + padding, height - text_rect.height // 2 - padding + 1))
+            text_rect.center = (x, y)
 
-            if not overlap:
+            # Check for overlap with nearby words only, considering the padding
+            if not grid_overlaps(word_grid, text_rect):
                 placed_successfully = True
                 break
 
+        if not placed_successfully and fits:
+            # Random draws can keep missing the last free gaps, so scan every
+            # candidate position in random order before giving up
+            for x, y, dx, dy in get_candidate_positions(text_rect, padding, speed, rng):
+                text_rect.center = (x, y)
+                if not grid_overlaps(word_grid, text_rect):
+                    placed_successfully = True
+                    break
+            else:
+                unplaceable_size = text_rect.size
+
         if placed_successfully:
             words.append({
                 'text': word, 'color': colors[color], 'congruent': i == congruent_index,
-                'rect': text_rect, 'dx': dx, 'dy': dy,
+                'surface': text_surface, 'rect': text_rect, 'dx': dx, 'dy': dy,
+                'x': float(x), 'y': float(y),  # Sub-pixel center position, rounded into 'rect' for drawing
                 'original_position': (x, y)  # Save the original position
             })
+            grid_insert(word_grid, text_rect.inflate(padding * 2, padding * 2), len(words) - 1)
         else:
-            print(f"Failed to place word '{word}' without overlap after {max_attempts} attempts.")
-
-    target_words_appear_time = time.time()
+            print(f"Failed to place word '{word}' without overlap: no free position left.")
 
     # Adjust the number of words if space is tight
     if len(words) < words_count:
         print("Not all words could be placed without overlap. Consider reducing word count or padding.")
 
-    return words
+    word_state = build_word_state(words)
+    if not movement:
+        # Words only move while dragged, so the placement grid stays valid for hit-testing
+        word_state['grid'] = word_grid
+    return word_state
+
+def prepare_next_words(trial):
+    # Lay out the next round's words in the background while the cursor waits in the start box
+    global next_words
+    next_words = (layout_executor.submit(create_stroop_words, trial), (width, height), trial)
+
+def take_next_words(trial):
+    # Swap in the prepared words, laying them out again if the window changed size meanwhile
+    global next_words
+    prepared, next_words = next_words, None
+    if prepared is None or prepared[1:] != ((width, height), trial):
+        return create_stroop_words(trial)
+    return prepared[0].result()
 
 def convert_to_cartesian(pygame_pos, height):
     x, y = pygame_pos
     cartesian_y = height - y
     return x, cartesian_y
 
-def adjust_coordinates(coords, origin):
-    return [(x - origin[0], y - origin[1], t) for (x, y, t) in coords]
-
-def handle_mouse_movement(phase, round_num):
+def get_box_geometry(start_box_origin):
+    # Box centres relative to the start box, which is the origin of the trajectories
+    target_box_x, target_box_y = convert_to_cartesian(left_box.center, height)
+    return {'start_box_x': 0, 'start_box_y': 0,
+            'target_box_x': target_box_x - start_box_origin[0], 'target_box_y': target_box_y - start_box_origin[1]}
+
+def start_cursor_sampler(rate):
+    # The sampler thread polls the cursor at a fixed rate into a ring buffer
+    # of (x, y) positions and session times. Only the thread advances
+    # cursor_samples_written and only the game loop advances
+    # cursor_samples_read, so no lock is needed.
+    global cursor_positions, cursor_times, cursor_samples_written, cursor_samples_read, cursor_sampler, cursor_reader_is_global
+    global cursor_sampling_description, cursor_button_transitions, input_timing_source
+    read_cursor, read_button, reader_name, cursor_reader_is_global = get_cursor_reader()
+    cursor_positions = np.zeros((rate * 4, 2))  # Room for 4 seconds without draining
+    cursor_times = np.zeros(rate * 4, dtype=np.int64)
+    cursor_samples_written = 0
+    cursor_samples_read = 0
+    if sys.platform == 'win32':
+        ctypes.windll.winmm.timeBeginPeriod(1)  # 1 ms sleep granularity
+    if read_button is not None:
+        # Left button presses and releases seen by the sampler, as (pressed, time)
+        cursor_button_transitions = collections.deque(maxlen=64)
+        input_timing_source = f"Cursor sampler button state ({rate} Hz) for clicks, event read time otherwise"
+    # While the game thread renders, the sampler only gets the GIL when the
+    # interpreter switches threads, every 5 ms by default; switch often
+    # enough for every sample to be taken on time
+    sys.setswitchinterval(min(sys.getswitchinterval(), 0.25 / rate))
+    cursor_sampler = threading.Thread(target=run_cursor_sampler, args=(read_cursor, read_button, 1.0 / rate), daemon=True)
+    cursor_sampler.start()
+    cursor_sampling_description = f"{rate} Hz thread ({reader_name})"
+
+def run_cursor_sampler(read_cursor, read_button, interval):
+    global cursor_samples_written
+    capacity = len(cursor_times)
+    button_pressed = read_button() if read_button is not None else False
+    next_sample_time = time.perf_counter()
+    while True:
+        sample_time = session_time_ns()
+        try:
+            x, y = read_cursor()
+        except pygame.error:
+            break  # The display was closed
+        cursor_positions[cursor_samples_written % capacity] = (x, y)
+        cursor_times[cursor_samples_written % capacity] = sample_time
+        cursor_samples_written += 1
+        if read_button is not None and read_button() != button_pressed:
+            button_pressed = not button_pressed
+            cursor_button_transitions.append((button_pressed, sample_time))
+        next_sample_time += interval
+        delay = next_sample_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_sample_time = time.perf_counter()  # Fell behind; resume the schedule from now rather than bursting
+
+def drain_cursor_samples():
+    # Positions and times written since the last drain, oldest first
+    global cursor_samples_read
+    written = cursor_samples_written
+    capacity = len(cursor_times)
+    if written - cursor_samples_read > capacity:
+        print(f"Cursor sampler overran its buffer; {written - cursor_samples_read - capacity} samples lost.")
+        cursor_samples_read = written - capacity
+    indices = np.arange(cursor_samples_read, written) % capacity
+    cursor_samples_read = written
+    return cursor_positions[indices], cursor_times[indices]
+
+def record_cursor_samples(phase, round_num):
+    global cursor_start_box_exit_time
+    positions, times = drain_cursor_samples()
+    if len(times) == 0:
+        return
+    if cursor_reader_is_global:
+        positions -= get_window_origin()
+
+    # Time of the first sample after the cursor last left the start box, or
+    # None while it is inside
+    inside = ((start_box.left <= positions[:, 0]) & (positions[:, 0] < start_box.right)
+              & (start_box.top <= positions[:, 1]) & (positions[:, 1] < start_box.bottom))
+    if inside.any():
+        first_outside = np.flatnonzero(inside)[-1] + 1
+        cursor_start_box_exit_time = int(times[first_outside]) if first_outside < len(times) else None
+    elif cursor_start_box_exit_time is None:
+        cursor_start_box_exit_time = int(times[0])
+
+    positions[:, 1] = height - positions[:, 1]  # Cartesian, as in convert_to_cartesian
+    get_trajectory_stream(phase, round_num).extend(positions[:, 0], positions[:, 1], times)
+
+    # Achieved rate and interval jitter, accumulated per round (intervals in seconds)
+    stats = cursor_sampling_stats.setdefault((current_block, round_num), {'intervals': 0, 'interval_sum': 0.0, 'interval_sum_sq': 0.0, 'max_interval': 0.0, 'last_time': None})
+    if stats['last_time'] is not None:
+        times = np.concatenate(([stats['last_time']], times))
+    intervals = np.diff(times) / 1e9
+    stats['last_time'] = times[-1]
+    if len(intervals):
+        stats['intervals'] += len(intervals)
+        stats['interval_sum'] += intervals.sum()
+        stats['interval_sum_sq'] += (intervals ** 2).sum()
+        stats['max_interval'] = max(stats['max_interval'], intervals.max())
+
+def get_start_box_exit_time(event_time):
+    # With the sampler running, the first sample outside the start box dates
+    # the exit; the motion event is only stamped when it was read from the
+    # queue, which is later while a frame is being drawn
+    if cursor_sampler is not None and cursor_start_box_exit_time is not None and cursor_start_box_exit_time <= event_time:
+        return cursor_start_box_exit_time
+    return event_time
+
+def get_event_time(event):
+    # When the input happened, on the session clock. SDL stamps events in
+    # milliseconds on the get_ticks() clock, but not every pygame build exposes
+    # it; clicks then use the cursor sampler's button transitions when it runs,
+    # and everything else the time the event was read from the queue: during
+    # the frame wait (arrival_time) or at the top of the loop.
+    global input_timing_source
+    timestamp = getattr(event, 'timestamp', None)
+    if timestamp is not None:
+        input_timing_source = "SDL event timestamps"
+        return event_capture_time - (event_capture_ticks - timestamp) * 1_000_000
+    read_time = getattr(event, 'arrival_time', event_capture_time)
+    if cursor_button_transitions is not None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) and event.button == 1:
+        transition_time = claim_button_transition(event.type == pygame.MOUSEBUTTONDOWN, read_time)
+        if transition_time is not None:
+            return transition_time
+    return read_time
+
+def claim_button_transition(pressed, read_time):
+    # Oldest unclaimed sampler transition to this button state from before the
+    # event was read. Transitions the game never received an event for
+    # (clicks outside the window) are too old to match and are dropped.
+    while cursor_button_transitions and cursor_button_transitions[0][1] <= read_time:
+        state, transition_time = cursor_button_transitions.popleft()
+        if state == pressed and read_time - transition_time < max_button_transition_age:
+            return transition_time
+    return None
+
+def handle_mouse_movement(phase, round_num, pos, current_time, phase_switch=False):
     global round_coordinates
-    pos = pygame.mouse.get_pos()
-    current_time = time.time()
+    if cursor_sampler is not None:
+        # The sampler's positions are drained once per frame at the top of the
+        # loop, and here only at the button press and release that switch
+        # phases, so samples from before the switch stay in their own phase
+        if phase_switch:
+            record_cursor_samples('start_phase_coords' if phase == "before_click" else 'target_phase_coords', round_num)
+        return
     pos = convert_to_cartesian(pos, height)
     if phase == "before_click":
-        if round_num not in round_coordinates['start_phase_coords']:
-            round_coordinates['start_phase_coords'][round_num] = []
-        round_coordinates['start_phase_coords'][round_num].append((pos[0], pos[1], current_time))
+        get_trajectory_stream('start_phase_coords', round_num).append(pos[0], pos[1], current_time)
     elif phase == "after_click":
-        if round_num not in round_coordinates['target_phase_coords']:
-            round_coordinates['target_phase_coords'][round_num] = []
-        round_coordinates['target_phase_coords'][round_num].append((pos[0], pos[1], current_time))
-
-def save_all_coords():
-    cwd = os.getcwd()
-    results_directory = os.path.join(cwd, "rawdata", f"ID-{study_id}", f"sub-{subject}", f"ses-{session}")
-    if not os.path.exists(results_directory):
-        os.makedirs(results_directory)
-        print(f"Created directory {results_directory}")
-
-    start_box_x, start_box_y = convert_to_cartesian(start_box.center, height)
-
-    for round_num, coords in round_coordinates['start_phase_coords'].items():
-        if advanced_control_var.get():
-            # Use font size, speed, and number of targets in the filename
-            filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_font-{font_large_size[1]}_speed-{movement_speed[1]}_targets-{words_per_level[1]}_phase-start.csv")
-        else:
-            # Use difficulty level in the filename
-            filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_level-{difficulty_level}_phase-start.csv")
-        
-        adjusted_coords = adjust_coordinates(coords, (start_box_x, start_box_y))
-        save_coords_to_csv(adjusted_coords, filename, save_boxes=True, start_box_origin=(start_box_x, start_box_y))
-
-    for round_num, coords in round_coordinates['target_phase_coords'].items():
-        if advanced_control_var.get():
-            # Use font size, speed, and number of targets in the filename
-            filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_font-{font_large_size[1]}_speed-{movement_speed[1]}_targets-{words_per_level[1]}_phase-deliver.csv")
-        else:
-            # Use difficulty level in the filename
-            filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_level-{difficulty_level}_phase-deliver.csv")
-        
-        adjusted_coords = adjust_coordinates(coords, (start_box_x, start_box_y))
-        save_coords_to_csv(adjusted_coords, filename, save_boxes=True, start_box_origin=(start_box_x, start_box_y))
+        get_trajectory_stream('target_phase_coords', round_num).append(pos[0], pos[1], current_time)
 
-def save_congruent_coords():
-    cwd = os.getcwd()
-    results_directory = os.path.join(cwd, "rawdata", f"ID-{study_id}", f"sub-{subject}", f"ses-{session}")
-    if not os.path.exists(results_directory):
-        os.makedirs(results_directory)
+def get_coords_filename(round_num, suffix):
+    results_directory = get_results_directory()
+    if advanced_control_var.get():
+        # Use font size, speed, and number of targets in the filename
+        return os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_font-{font_large_size[1]}_speed-{movement_speed[1]}_targets-{words_per_level[1]}_{suffix}.csv")
+    # Use difficulty level in the filename
+    return os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_level-{difficulty_level}_{suffix}.csv")
+
+def get_trajectory_stream(phase, round_num):
+    phase_coords = round_coordinates[phase]
+    if round_num not in phase_coords:
+        stream = TrajectoryStream(get_coords_filename(round_num, phase_file_suffixes[phase]),
+                                  (int(block), round_num, phase_file_suffixes[phase]), trajectory_chunk_size)
+        # Input after the round ended (e.g. grabbing a leftover word) extends
+        # the finished file instead of overwriting it
+        stream.started = stream.filename in finished_trajectory_files
+        phase_coords[round_num] = stream
+    return phase_coords[round_num]
+
+def finish_round_trajectories(round_num):
+    # Round boundary: complete the round's files and release its samples
+    for phase_coords in round_coordinates.values():
+        stream = phase_coords.pop(round_num, None)
+        if stream is not None:
+            stream.close()
+            finished_trajectory_files.add(stream.filename)
+    save_congruent_coords(round_num)
 
+def save_all_coords():
+    # Rounds normally finish their own files; this closes any still streaming
+    # (a round cut short by closing the window)
+    for phase_coords in round_coordinates.values():
+        for stream in phase_coords.values():
+            stream.close()
+        phase_coords.clear()
+
+def start_target_segment(round_num, index, start_time):
+    # Targets move in straight lines at constant speed, so a trajectory is
+    # stored as [start x, start y, dx, dy, start time, end time] segments
+    # (pygame coordinates, pixels per second, session clock nanoseconds).
+    # A new segment starts whenever a word is put back at its spawn position.
+    congruent_word_segments.setdefault(round_num, []).append([
+        float(current_words['x'][index]), float(current_words['y'][index]),
+        float(current_words['dx'][index]), float(current_words['dy'][index]), start_time, None
+    ])
+
+def end_target_segment(round_num, end_time):
+    # The word was picked up or left the screen
+    segments = congruent_word_segments.get(round_num)
+    if segments and segments[-1][5] is None:
+        segments[-1][5] = end_time
+
+def reconstruct_target_positions(segments, times):
+    # Target centre at each session time (ns) in pygame coordinates; NaN where
+    # no segment covers the time. An open segment extends to any later time.
+    times = np.asarray(times, dtype=np.int64)
+    x = np.full(len(times), np.nan)
+    y = np.full(len(times), np.nan)
+    for start_x, start_y, dx, dy, start_time, end_time in segments:
+        covered = (times >= start_time) if end_time is None else ((times >= start_time) & (times <= end_time))
+        elapsed = (times[covered] - start_time) / 1e9
+        x[covered] = start_x + dx * elapsed
+        y[covered] = start_y + dy * elapsed
+    return x, y
+
+def save_congruent_coords(round_num=None):
+    # Writes and releases the given round's target trajectory, or every one still held
     start_box_x, start_box_y = convert_to_cartesian(start_box.center, height)
-
-    for round_num, coords in congruent_word_coords.items():
-        if advanced_control_var.get():
-            # Use font size, speed, and number of targets in the filename
-            filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_font-{font_large_size[1]}_speed-{movement_speed[1]}_targets-{words_per_level[1]}_congruent_coords.csv")
-        else:
-            # Use difficulty level in the filename
-            filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_round-{round_num}_level-{difficulty_level}_congruent_coords.csv")
-        
-        adjusted_coords = adjust_coordinates(coords, (start_box_x, start_box_y))
-        save_coords_to_csv(adjusted_coords, filename, save_boxes=True, start_box_origin=(start_box_x, start_box_y))
-
-def save_coords_to_csv(coords, filename, save_boxes=False, start_box_origin=(0, 0)):
-    with open(filename, mode='w', newline='') as file:
+    box_geometry = get_box_geometry((start_box_x, start_box_y))
+
+    save_time = session_time_ns()
+    for round_num in (list(congruent_word_segments) if round_num is None else [round_num]):
+        segments = congruent_word_segments.pop(round_num, None)
+        if not segments:
+            continue
+        # One row at each end of every segment; positions in between follow
+        # from reconstruct_target_positions()
+        coords = TrajectoryBuffer(len(segments) * 2)
+        for segment in segments:
+            segment_times = [segment[4], save_time if segment[5] is None else segment[5]]
+            x, y = reconstruct_target_positions([segment], segment_times)
+            coords.extend(x, height - y, segment_times)
+
+        x, y, t = coords.view()
+        segment_ends = np.tile([False, True], len(segments))
+        queue_trajectory_write(get_coords_filename(round_num, 'congruent_coords'), (int(block), round_num, 'congruent_coords'),
+                               x - start_box_x, y - start_box_y, t, box_geometry, segment_ends=segment_ends)
+
+def compute_kinematics(x, y, t, segment_ends=None):
+    # Velocity, acceleration and jerk as forward differences toward the
+    # following samples, in one pass over the columns. Samples read in the same
+    # batch share a timestamp, so, as in KinematicsAccumulator, each distinct
+    # timestamp is one step: the path covered until the next timestamp over the
+    # time between them, given to every row with that timestamp. Rows without
+    # enough following timestamps (the last one, two and three) get 0.
+    # segment_ends marks rows after which the path jumps (a target sent back
+    # to its spawn position); no derivative is taken across those jumps.
+    new_time = np.diff(t) != 0
+    starts = np.concatenate(([0], np.flatnonzero(new_time) + 1))  # First row of each timestamp
+    row_step = np.concatenate(([0], np.cumsum(new_time)))  # Timestamp index of each row
+    distance = np.hypot(np.diff(x), np.diff(y))[:starts[-1]]
+    step_rate = np.diff(t[starts]) / 1e9
+    np.divide(1, step_rate, out=step_rate, where=step_rate > 0)
+    velocity = np.zeros(len(starts))
+    acceleration = np.zeros(len(starts))
+    jerk = np.zeros(len(starts))
+    velocity[:-1] = np.add.reduceat(distance, starts[:-1]) * step_rate
+    acceleration[:-2] = np.diff(velocity[:-1]) * step_rate[:-1]
+    jerk[:-3] = np.diff(acceleration[:-2]) * step_rate[:-2]
+    if segment_ends is not None:
+        # Whether each step stays within a segment: no segment ends in its rows
+        ends_before = np.concatenate(([0], np.cumsum(segment_ends)))
+        joined = ends_before[starts[1:]] == ends_before[starts[:-1]]
+        velocity[:-1][~joined] = 0
+        acceleration[:-2][~(joined[:-1] & joined[1:])] = 0
+        jerk[:-3][~(joined[:-2] & joined[1:-1] & joined[2:])] = 0
+    return velocity[row_step], acceleration[row_step], jerk[row_step]
+
+def get_complete_rows(t):
+    # Number of leading rows whose derivatives the samples in t determine:
+    # all but those of the last kinematics_lookahead distinct timestamps
+    starts = np.flatnonzero(np.diff(t)) + 1
+    return int(starts[-kinematics_lookahead]) if len(starts) >= kinematics_lookahead else 0
+
+def save_trajectory(filename, x, y, t, box_geometry=None, append=False, final=True, segment_ends=None):
+    # Writes the trajectory columns with a single write. The box geometry is
+    # constant per file, so it goes once in a '#' line above the column header.
+    # With append, the rows are added to an existing file without a header.
+    # Without final, the samples of the last kinematics_lookahead timestamps
+    # are left out; the next call must start with them.
+    with io.StringIO() as text:
+        if not append:
+            if box_geometry:
+                text.write("# " + ",".join(f"{name}={value}" for name, value in box_geometry.items()) + "\n")
+            text.write("X,Y,Time (ns),Velocity (pixels/second),Acceleration (pixels/second^2),Jerk (pixels/second^3)\n")
+        text.write(format_trajectory_rows(x, y, t, final, ",", segment_ends))
+        with open(filename, mode='a' if append else 'w', newline='') as file:
+            file.write(text.getvalue())
+
+def format_trajectory_rows(x, y, t, final, delimiter, segment_ends=None):
+    # All rows formatted in one operation: position, time, velocity, acceleration, jerk
+    rows = len(t) if final else get_complete_rows(t)
+    if rows <= 0:
+        return ""
+    velocity, acceleration, jerk = compute_kinematics(x, y, t, segment_ends)
+    columns = np.column_stack((x, y, t, velocity, acceleration, jerk))[:rows]
+    row_format = delimiter.join(["%.2f", "%.2f", "%d", "%.6g", "%.6g", "%.6g"]) + "\n"
+    return (row_format * rows) % tuple(columns.ravel().tolist())
+
+def get_motion_filename(run):
+    # BIDS-style name without the extension: the run index is the trial
+    # number in the session, and everything else goes in the sidecar. The
+    # hand is part of the acquisition label (BIDS labels are alphanumeric),
+    # so both hands of a session can be recorded into one directory.
+    block_number, round_number, phase = run
+    acquisition = {'phase-start': 'start', 'phase-deliver': 'deliver', 'congruent_coords': 'target'}[phase]
+    hand_label = ''.join(character for character in hand if character.isalnum())
+    return os.path.join(get_results_directory(), f"sub-{subject}_ses-{session}_task-cognitivemotor_acq-{acquisition}hand{hand_label}_run-{get_trial_index(block_number, round_number) + 1}_motion")
+
+def get_motion_sidecar(run, box_geometry):
+    block_number, round_number, phase = run
+    sidecar = {
+        'TaskName': "cognitivemotor",
+        'StudyID': study_id,
+        'Block': block_number,
+        'Round': round_number,
+        'Phase': phase,
+        'Hand': hand,
+        'SamplingFrequency': cursor_sampling_rate if cursor_sampling_rate and phase != 'congruent_coords' else "n/a",
+        'CursorSampling': cursor_sampling_description if phase != 'congruent_coords' else "Target segment endpoints",
+        'Columns': ['x', 'y', 'time', 'velocity', 'acceleration', 'jerk'],
+        'Units': ['pixels', 'pixels', 'ns', 'pixels/s', 'pixels/s^2', 'pixels/s^3'],
+        'ScreenSize': [width, height],
+        'StartBox': [box_geometry['start_box_x'], box_geometry['start_box_y']],
+        'TargetBox': [box_geometry['target_box_x'], box_geometry['target_box_y']],
+        'MovingTargets': bool(movement),
+        'FontSize': get_large_font_size(),
+        'MovementSpeed': get_movement_speed(),
+        'NumberOfTargets': get_words_count(),
+        'RandomSeed': session_seed
+    }
+    if not use_advanced_settings:
+        sidecar['DifficultyLevel'] = difficulty_level
+    return sidecar
+
+def save_motion_chunk(filename, x, y, t, sidecar=None, append=False, final=True, segment_ends=None):
+    # Tab-separated, gzip-compressed rows without a header; the JSON sidecar
+    # names the columns and holds everything constant for the run. The gzip
+    # stream stays open across a round's chunks, so the data is compressed as
+    # it arrives instead of in one pass at the end.
+    if sidecar is not None:
+        with open(filename + ".json", "w") as file:
+            json.dump(sidecar, file, indent=4)
+    motion_file = open_motion_files.pop(filename, None)
+    if motion_file is None:
+        motion_file = gzip.open(filename + ".tsv.gz", 'at' if append else 'wt', newline='')
+    motion_file.write(format_trajectory_rows(x, y, t, final, "\t", segment_ends))
+    if final:
+        motion_file.close()
+    else:
+        open_motion_files[filename] = motion_file
+
+def get_trajectory_container_filenames():
+    base = os.path.join(get_results_directory(), f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_trajectories")
+    return base + ".bin", base + "_index.csv"
+
+def append_to_trajectory_container(run, name, x, y, t, box_geometry, segment_ends=None):
+    # One binary container per session. Each chunk is stored as int32 x,
+    # int32 y and int64 time columns back to back, and indexed by
+    # (block, round, phase) and byte offset, so readers can memory-map any
+    # trajectory instead of parsing text. The data is written before its
+    # index row, so the index never points past the end of the file.
+    # Samples after which the path jumps (segment_ends) are listed in the
+    # index row by their position in the chunk.
+    # Restarting the game for the same session (e.g. after a crash) appends
+    # to the container; each index row records the launch it came from.
+    global trajectory_container_size
+    data_filename, index_filename = get_trajectory_container_filenames()
+    padding = 0
+    if trajectory_container_size is None:
+        # Continue after whatever the container already holds, including
+        # unindexed bytes left by a crash, keeping chunks 16-byte aligned
+        trajectory_container_size = os.path.getsize(data_filename) if os.path.exists(data_filename) else 0
+        padding = -trajectory_container_size % 16
+        trajectory_container_size += padding
+    new_index = not os.path.exists(index_filename)
+    with open(data_filename, 'ab') as file:
+        file.write(bytes(padding))
+        file.write(np.rint(x).astype(np.int32).tobytes())
+        file.write(np.rint(y).astype(np.int32).tobytes())
+        file.write(np.asarray(t, dtype=np.int64).tobytes())
+    with open(index_filename, 'a', newline='') as file:
         writer = csv.writer(file)
-        start_box_x, start_box_y = start_box_origin
-        target_box_x, target_box_y = convert_to_cartesian(left_box.center, height)
-        target_box_x -= start_box_x
-        target_box_y -= start_box_y
-
-        if save_boxes:
-            writer.writerow(['X', 'Y', 'Time', 'Velocity (pixels/second)', 'start_box_x', 'start_box_y', 'target_box_x', 'target_box_y'])
-        else:
-            writer.writerow(['X', 'Y', 'Time', 'Velocity (pixels/second)'])
-        
-        for i in range(1, len(coords)):
-            x1, y1, t1 = coords[i-1]
-            x2, y2, t2 = coords[i]
-            distance = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
-            time_diff = t2 - t1
-            if time_diff > 0:
-                velocity = distance / time_diff
-            else:
-                velocity = 0
-            if save_boxes:
-                writer.writerow([x1, y1, t1, velocity, 0, 0, target_box_x, target_box_y])
-            else:
-                writer.writerow([x1, y1, t1, velocity])
-        if coords:
-            x, y, t = coords[-1]
-            if save_boxes:
-                writer.writerow([x, y, t, 0, 0, 0, target_box_x, target_box_y])
-            else:
-                writer.writerow([x, y, t, 0])
+        if new_index:
+            writer.writerow(['Launch', 'Block', 'Round', 'Phase', 'Name', 'Offset (bytes)', 'Samples', 'Segment Ends', *box_geometry])
+        ends = " ".join(map(str, np.flatnonzero(segment_ends))) if segment_ends is not None else ""
+        writer.writerow([f"{session_start_wall_time:.6f}", *run, name, trajectory_container_size, len(t), ends, *box_geometry.values()])
+    trajectory_container_size += 16 * len(t)
+
+def queue_trajectory_write(filename, run, x, y, t, box_geometry, append=False, final=True, segment_ends=None):
+    if trajectory_format == "Binary":
+        # The CSV file name, without its extension, names the run in the index
+        name = os.path.splitext(os.path.basename(filename))[0]
+        queue_write(append_to_trajectory_container, run, name, x, y, t, box_geometry, segment_ends=segment_ends)
+    elif trajectory_format == "TSV.gz":
+        queue_write(save_motion_chunk, get_motion_filename(run), x, y, t,
+                    sidecar=None if append else get_motion_sidecar(run, box_geometry), append=append, final=final,
+                    segment_ends=segment_ends)
+    else:
+        queue_write(save_trajectory, filename, x, y, t, box_geometry=box_geometry, append=append, final=final,
+                    segment_ends=segment_ends)
+
+def flush_block_trajectories():
+    # Write whatever the current block still holds, then release it. The
+    # buffers only ever hold the block in progress, so a later save can never
+    # rewrite an earlier block's files and memory does not grow from block to block.
+    save_all_coords()
+    save_congruent_coords()
+    finished_trajectory_files.clear()
+
+def complete_block():
+    # Persist the block once, as soon as it ends; the writes run in the background
+    global block_complete
+    block_complete = True
+    save_results()
+    flush_block_trajectories()
+
+def run_persistence_writer():
+    # Performs queued file writes in order, so the game loop never waits on the disk
+    while True:
+        write, args, kwargs = persistence_queue.get()
+        try:
+            write(*args, **kwargs)
+        except Exception as e:
+            # Any failure is reported and the writer carries on: if the thread
+            # died, wait_for_pending_writes() would hang and queue_write()
+            # would block the game loop once the queue filled up
+            print(f"Error saving results with {write.__name__}: {type(e).__name__}: {e}")
+        finally:
+            persistence_queue.task_done()
+
+def queue_write(write, *args, **kwargs):
+    # The arguments must be a snapshot the game loop will not change afterwards.
+    # Blocks only when the writer has fallen a full queue behind.
+    persistence_queue.put((write, args, kwargs))
+
+def wait_for_pending_writes():
+    persistence_queue.join()
+
+def write_text_file(filename, text):
+    with open(filename, "w") as file:
+        file.write(text)
 
 def save_results():
-    cwd = os.getcwd()
-    results_directory = os.path.join(cwd, "rawdata", f"ID-{study_id}", f"sub-{subject}", f"ses-{session}")
-    if not os.path.exists(results_directory):
-        os.makedirs(results_directory)
-        print(f"Created directory {results_directory}")
+    results_directory = get_results_directory()
     
     # Determine the filename based on whether advanced control is enabled
     if advanced_control_var.get():
@@ -499,8 +1580,11 @@ def save_results():
         # Use difficulty level in the filename
         filename = os.path.join(results_directory, f"sub-{subject}_ses-{session}_ID-{study_id}_hand-{hand}_block-{block}_level-{difficulty_level}_results.txt")
     
-    with open(filename, "w") as file:
+    # Formatted here and written by the writer thread
+    with io.StringIO() as file:
         file.write(f"Date/Time: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        file.write(f"Session Clock Start: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session_start_wall_time))} (Unix time {session_start_wall_time:.6f})\n")
+        file.write(f"Session Clock: perf_counter_ns, trajectory times in nanoseconds since the session clock start\n")
         file.write(f"Subject: {subject}\n")
         file.write(f"Session: {session}\n")
         file.write(f"Study ID: {study_id}\n")
@@ -508,6 +1592,27 @@ def save_results():
         file.write(f"Total Rounds: {max_rounds}\n")
         file.write(f"Hand: {hand}\n")
         file.write(f"Movement: {movement}\n")
+        file.write(f"Random Seed: {session_seed}\n")
+        file.write(f"Target Refresh Rate: {fps} Hz\n")
+        if vsync_active:
+            file.write(f"VSync: Enabled\n")
+        elif use_vsync:
+            file.write(f"VSync: Unavailable\n")
+        else:
+            file.write(f"VSync: Disabled\n")
+        file.write(f"Frame Pacing: {frame_pacing}\n")
+        file.write(f"Renderer: {renderer_description}\n")
+        file.write(f"Cursor Sampling: {cursor_sampling_description}\n")
+        file.write(f"Trajectory Format: {trajectory_format}\n")
+        file.write(f"Input Timing: {input_timing_source}\n")
+        if block_frame_time > 0:
+            file.write(f"Achieved Frame Rate: {block_frame_count / block_frame_time:.2f} fps\n")
+        if real_time_mode:
+            file.write(f"Real-Time Mode: Enabled\n")
+            file.write(f"Garbage Collection: Frozen during rounds, collected between rounds\n")
+            file.write(f"Process Priority: {process_priority}\n")
+        else:
+            file.write(f"Real-Time Mode: Disabled\n")
         if advanced_control_var.get():
             file.write(f"Advanced Controls: Enabled\n")
             file.write(f"Font Size: {font_large_size[1]}\n")
@@ -531,6 +1636,9 @@ def save_results():
                     file.write(f"Round {result['round_number']} Drag Reaction Time: {result['reaction_time']:.2f} ms\n")
                     file.write(f"Round {result['round_number']} Drag Path Length: {result['path_length']:.2f} pixels\n")
                     file.write(f"Round {result['round_number']} Total Path Length: {result['path_length_outside_target']:.2f} pixels\n")
+                    file.write(f"Round {result['round_number']} Peak Velocity: {result['peak_velocity']:.2f} pixels/second\n")
+                    if result['movement_onset'] is not None:
+                        file.write(f"Round {result['round_number']} Movement Onset: {result['movement_onset']:.2f} ms\n")
                 elif result['status'] == 'incorrect':
                     file.write(f"Block {block}, Round {result['round_number']} Status: Incorrect\n")
                     file.write(f"Round {result['round_number']} Time to target from start zone: {result['reaction_time_to_target']:.2f} ms\n")
@@ -538,12 +1646,25 @@ def save_results():
                     file.write(f"Round {result['round_number']} Drag Reaction Time: {result['reaction_time']:.2f} ms\n")
                     file.write(f"Round {result['round_number']} Drag Path Length: {result['path_length']:.2f} pixels\n")
                     file.write(f"Round {result['round_number']} Total Path Length: {result['path_length_outside_target']:.2f} pixels\n")
+                    file.write(f"Round {result['round_number']} Peak Velocity: {result['peak_velocity']:.2f} pixels/second\n")
+                    if result['movement_onset'] is not None:
+                        file.write(f"Round {result['round_number']} Movement Onset: {result['movement_onset']:.2f} ms\n")
                 else:
                     file.write(f"Block {block}, Round {result['round_number']} Status: Missed\n")
                 file.write(f"====================================\n")
 
+        for (block_number, round_number), stats in sorted(cursor_sampling_stats.items()):
+            if block_number == int(block) and stats['intervals'] > 0:
+                mean_interval = stats['interval_sum'] / stats['intervals']
+                jitter = max(stats['interval_sum_sq'] / stats['intervals'] - mean_interval ** 2, 0) ** 0.5
+                file.write(f"Round {round_number} Cursor Sampling Rate: {1 / mean_interval:.1f} Hz\n")
+                file.write(f"Round {round_number} Cursor Sample Interval Jitter (SD): {jitter * 1000:.3f} ms\n")
+                file.write(f"Round {round_number} Cursor Sample Interval Max: {stats['max_interval'] * 1000:.2f} ms\n")
+        queue_write(write_text_file, filename, file.getvalue())
+
 def start_next_block():
     global block, current_block, total_blocks, block_complete
+    wait_for_pending_writes()  # The finished block is on disk before the next one starts
     current_block += 1
     if current_block <= total_blocks:
         block = str(current_block)
@@ -553,13 +1674,11 @@ def start_next_block():
         global running
         running = False  # End the game after the last block
         print("All blocks completed. Saving Results...")
-        save_results()
-        save_all_coords()
-        save_congruent_coords()
+        wait_for_pending_writes()
         pygame.quit()
         sys.exit()
 
-def display_instructions(screen, font):
+def render_instructions_panel(font):
     instructions_text = [
         "To begin, maximize the game window.",
         "During gameplay, drag the congruent target (the word and color match) to the 'congruent' box.",
@@ -568,108 +1687,178 @@ def display_instructions(screen, font):
         "After all rounds are completed, click the button to start the next block."
     ]
 
-    width, height = screen.get_size()
     text_height = font.get_height()
     padding = 10
     total_height = padding * 2 + (text_height * len(instructions_text)) + ((len(instructions_text) - 1) * 5)
     text_widths = [font.size(line)[0] for line in instructions_text]
     max_width = max(text_widths) + 2 * padding
-    box_x = (width - max_width) // 2
-    box_y = 20
 
     background_color = (0, 0, 139)  # Dark blue
-    pygame.draw.rect(screen, background_color, (box_x, box_y, max_width, total_height))
+    panel = pygame.Surface((max_width, total_height))
+    panel.fill(background_color)
 
     text_color = (255, 255, 224)  # Light yellow
     for idx, line in enumerate(instructions_text):
         text_surface = font.render(line, True, text_color)
-        text_x = box_x + (max_width - text_widths[idx]) // 2
-        text_y = box_y + padding + idx * (text_height + 5)
-        screen.blit(text_surface, (text_x, text_y))
+        text_x = (max_width - text_widths[idx]) // 2
+        text_y = padding + idx * (text_height + 5)
+        panel.blit(text_surface, (text_x, text_y))
+    return panel
+
+def display_instructions(screen, font):
+    # The panel is rendered once and only re-positioned when the window size changes
+    if font not in instructions_panel_cache:
+        instructions_panel_cache[font] = render_instructions_panel(font)
+    panel = instructions_panel_cache[font]
+
+    width, height = screen.get_size()
+    box_x = (width - panel.get_width()) // 2
+    box_y = 20
+    screen.blit(panel, (box_x, box_y))
+
+def render_button(text, color, size):
+    button_surface = pygame.Surface(size)
+    button_surface.fill(color)
+    text_surf = get_text_surface(text, (255, 255, 255), 36)
+    button_surface.blit(text_surf, text_surf.get_rect(center=button_surface.get_rect().center))
+    return button_surface
 
-def draw_button(screen, text, rect, color, hover_color):
+def draw_button(text, rect, color, hover_color):
     mouse = pygame.mouse.get_pos()
     if rect.collidepoint(mouse):
-        pygame.draw.rect(screen, hover_color, rect)
-    else:
-        pygame.draw.rect(screen, color, rect)
+        color = hover_color
+
+    # Both hover states are cached, so a hover flip only swaps surfaces
+    key = (text, color, rect.size)
+    if key not in button_surface_cache:
+        button_surface_cache[key] = render_button(text, color, rect.size)
+    draw_surface(button_surface_cache[key], rect)
+
+def render_metrics(metrics_text):
+    metrics_surfaces = [font_small.render(text, True, (255, 255, 255)) for text in metrics_text]
+    metrics_rects = [surface.get_rect(topleft=(10, 10 + idx * 20)) for idx, surface in enumerate(metrics_surfaces)]
+    return metrics_surfaces, metrics_rects
 
-    font = pygame.font.Font(None, 36)
-    text_surf = font.render(text, True, (255, 255, 255))
-    text_rect = text_surf.get_rect(center=rect.center)
-    screen.blit(text_surf, text_rect)
+def draw_static_layer():
+    # Everything that stays put between frames is drawn once onto a background
+    # surface, which is also used to erase moving words in dirty-rect mode
+    layer = pygame.Surface(get_window_size())
+    layer.fill((0, 0, 0))
+
+    if show_instructions:
+        display_instructions(layer, font_small)
+
+    if not block_complete:
+        pygame.draw.rect(layer, (255, 140, 0), start_box)
+        pygame.draw.rect(layer, (255, 255, 255), left_box, 5)
+        layer.blit(start_label_surface, start_label_surface.get_rect(center=start_box.center))
+        layer.blit(congruent_label_surface, congruent_label_surface.get_rect(center=left_box.center))
+    return layer
 
 # Main game loop
 show_instructions = True
+if cursor_sampling_rate:
+    start_cursor_sampler(cursor_sampling_rate)
+persistence_writer = threading.Thread(target=run_persistence_writer, daemon=True)
+persistence_writer.start()
+
 running = True
 paused = False  # New flag to pause the game
 missed_rounds = []  # List to track missed rounds
 round_results = []  # List to track results of each round
+background = None
+previous_static_layer_key = None
+previous_word_rects = []  # Screen areas covered by words in the last frame
+previous_metrics_area = pygame.Rect(10, 10, 0, 0)
+previous_metrics_key = None
 
 while running:
     if paused:
         pygame.event.wait()  # Wait for an event and avoid consuming CPU
         continue
-    
-    for event in pygame.event.get():
+
+    # When nothing is animating (between rounds or on the block complete screen),
+    # block until the next event or the idle timer instead of redrawing at full rate
+    idle = not in_round and not current_words['alive'].any() and not dragging and not waiting and not arrived_events
+    if idle:
+        event = pygame.event.wait(idle_timeout)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+    else:
+        events = pygame.event.get()
+    event_capture_time = session_time_ns()
+    event_capture_ticks = pygame.time.get_ticks()
+    if arrived_events:
+        events = arrived_events + events
+        arrived_events.clear()
+
+    if cursor_sampler is not None:
+        if in_round:
+            record_cursor_samples('target_phase_coords' if dragging else 'start_phase_coords', current_round)
+        else:
+            drain_cursor_samples()  # Only samples taken during a round are kept
+
+    for event in events:
         if event.type == pygame.QUIT:
             print("Game window closed. Saving Results...")
-            save_results()
-            save_all_coords()
-            save_congruent_coords()
+            if not block_complete:
+                save_results()
+                flush_block_trajectories()
+            wait_for_pending_writes()
             pygame.quit()
             sys.exit()
         elif event.type == pygame.VIDEORESIZE:
             update_positions()
-            screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-            display_instructions(screen, font_small)
+            screen = set_display_mode((event.w, event.h))
+        elif event.type == pygame.WINDOWSIZECHANGED and renderer is not None:
+            update_positions()  # The texture window does not send VIDEORESIZE
         elif event.type == pygame.MOUSEBUTTONDOWN:
+            event_time = get_event_time(event)
             if block_complete and button_rect.collidepoint(event.pos):
                 if current_block < total_blocks:
                     start_next_block()
                 else:
                     running = False
                     print("All blocks completed. Saving Results...")
-                    save_results()
-                    save_all_coords()
-                    save_congruent_coords()
+                    wait_for_pending_writes()  # The block was saved when it completed
                     pygame.quit()
                     sys.exit()
 
-            current_click_time = pygame.time.get_ticks()
-            if last_click_time and current_click_time - last_click_time < click_threshold:
+            current_click_time = event_time
+            if last_click_time and current_click_time - last_click_time < click_threshold * 1_000_000:
                 print("Double click detected, ignoring.")
             else:
-                for word in current_words:
-                    inflated_rect = word['rect'].inflate(40, 40)
-                    if inflated_rect.collidepoint(event.pos):
-                        selected_word = word
-                        dragging = True
-                        selected_word['start_time'] = time.time()
-                        handle_mouse_movement("before_click", current_round)
-                        last_mouse_pos = event.pos
-                        if mouse_left_start_time is not None and selected_word['congruent']:
-                            reaction_time_from_start = round((time.time() - mouse_left_start_time) * 1000, 2)
-                            print(f"Reaction time from start zone: {reaction_time_from_start:.2f} ms")
-                            reaction_time_to_target.append(reaction_time_from_start)
-                        break
+                word_index = find_word_at(current_words, event.pos)
+                if word_index is not None:
+                    selected_word = word_index
+                    dragging = True
+                    selected_word_start_time = event_time
+                    if current_words['congruent'][selected_word]:
+                        end_target_segment(current_round, event_time)
+                    round_kinematics.add(event.pos[0], event.pos[1], event_time, False)
+                    handle_mouse_movement("before_click", current_round, event.pos, event_time, phase_switch=True)
+                    if mouse_left_start_time is not None and current_words['congruent'][selected_word]:
+                        reaction_time_from_start = round((event_time - mouse_left_start_time) / 1e6, 2)
+                        print(f"Reaction time from start zone: {reaction_time_from_start:.2f} ms")
+                        reaction_time_to_target.append(reaction_time_from_start)
             last_click_time = current_click_time
         elif event.type == pygame.MOUSEBUTTONUP:
-            if dragging and selected_word:
+            event_time = get_event_time(event)
+            if dragging and selected_word is not None:
                 dragging = False
-                handle_mouse_movement("after_click", current_round)
-                correct = left_box.collidepoint(event.pos) and selected_word['congruent']
-                block_end_time = time.time()
-                block_time = block_end_time - block_start_time
+                handle_mouse_movement("after_click", current_round, event.pos, event_time, phase_switch=True)
+                correct = left_box.collidepoint(event.pos) and current_words['congruent'][selected_word]
+                block_end_time = event_time
+                block_time = (block_end_time - block_start_time) / 1e9
                 if correct:
-                    end_time = time.time()
-                    reaction_time = (end_time - selected_word['start_time']) * 1000
+                    end_time = event_time
+                    reaction_time = (end_time - selected_word_start_time) / 1e6
                     category_key = 'congruent_correct'
                     reaction_times[category_key].append(reaction_time)
                     correct_responses += 1
-                    if selected_word in current_words:
-                        current_words.remove(selected_word)
+                    current_words['alive'][selected_word] = False
                     in_round = False
+                    finish_round_trajectories(current_round)
                     round_results.append({
                         'round_number': current_round,
                         'status': 'success',
@@ -678,21 +1867,21 @@ while running:
                         'reaction_time_to_target': reaction_time_from_start,
                         'dwell_time': dwell_time_from_appearance_to_start[-1],
                         'reaction_time': reaction_time,
-                        'path_length': path_length,
-                        'path_length_outside_target': path_length_outside_target
+                        'path_length': round_kinematics.drag_path_length,
+                        'path_length_outside_target': round_kinematics.path_length,
+                        'peak_velocity': round_kinematics.peak_velocity,
+                        'movement_onset': round_kinematics.movement_onset_latency(target_words_appear_time)
                     })
                     block_times.append(block_time)
-                    block_path_lengths.append(path_length)
-                    block_path_lengths_outside_target.append(path_length_outside_target)
-                    path_length = 0
-                    path_length_outside_target = 0
+                    block_path_lengths.append(round_kinematics.drag_path_length)
+                    block_path_lengths_outside_target.append(round_kinematics.path_length)
 
                     # After the final round's completion, set block_complete to True
                     if current_round >= max_rounds:
-                        block_complete = True
+                        complete_block()
 
                     if in_round == False:
-                        current_words.clear()
+                        current_words = build_word_state([])
                         in_round = False
                 else:
                     incorrect_responses += 1
@@ -703,106 +1892,150 @@ while running:
                         'block_time': block_time,
                         'reaction_time_to_target': reaction_time_from_start,
                         'dwell_time': dwell_time_from_appearance_to_start[-1],
-                        'reaction_time': (time.time() - selected_word['start_time']) * 1000,
-                        'path_length': path_length,
-                        'path_length_outside_target': path_length_outside_target
+                        'reaction_time': (event_time - selected_word_start_time) / 1e6,
+                        'path_length': round_kinematics.drag_path_length,
+                        'path_length_outside_target': round_kinematics.path_length,
+                        'peak_velocity': round_kinematics.peak_velocity,
+                        'movement_onset': round_kinematics.movement_onset_latency(target_words_appear_time)
                     })
-                    selected_word['rect'].center = selected_word['original_position']
+                    current_words['x'][selected_word] = current_words['original_x'][selected_word]
+                    current_words['y'][selected_word] = current_words['original_y'][selected_word]
+                    if current_words['congruent'][selected_word]:
+                        start_target_segment(current_round, selected_word, event_time)
                 selected_word = None
         elif event.type == pygame.MOUSEMOTION:
             if in_round:
-                current_pos = np.array(event.pos)
-                if last_mouse_pos is not None:
-                    last_pos = np.array(last_mouse_pos)
-                    movement_vector = current_pos - last_pos
-                    movement_distance = np.linalg.norm(movement_vector)
-                    path_length_outside_target += movement_distance
+                motion_time = get_event_time(event)
+                round_kinematics.add(event.pos[0], event.pos[1], motion_time, dragging and selected_word is not None)
                 if start_box.collidepoint(event.pos):
                     mouse_left_start_time = None
                 elif mouse_left_start_time is None:
-                    mouse_left_start_time = time.time()
+                    mouse_left_start_time = get_start_box_exit_time(motion_time)
                     if target_words_appear_time is not None:
-                        dwell_time_from_appearance_to_start_value = (mouse_left_start_time - target_words_appear_time) * 1000
+                        dwell_time_from_appearance_to_start_value = (mouse_left_start_time - target_words_appear_time) / 1e6
                         dwell_time_from_appearance_to_start.append(dwell_time_from_appearance_to_start_value)
                         print(f"Dwell time: {dwell_time_from_appearance_to_start_value:.2f} ms")
-                handle_mouse_movement("after_click" if dragging else "before_click", current_round)
-                if dragging and selected_word and last_mouse_pos is not None:
-                    selected_word['rect'].center = pygame.mouse.get_pos()
-                    path_length += movement_distance
-                last_mouse_pos = event.pos
+                handle_mouse_movement("after_click" if dragging else "before_click", current_round, event.pos, motion_time)
+                if dragging and selected_word is not None:
+                    current_words['x'][selected_word], current_words['y'][selected_word] = event.pos
 
-    screen.fill((0, 0, 0))
-
-    if show_instructions:
-        display_instructions(screen, font_small)
-        if current_round > 0:
-            show_instructions = False
+    if show_instructions and current_round > 0:
+        show_instructions = False
 
     if not block_complete:
         if start_box.collidepoint(pygame.mouse.get_pos()):
-            current_time = time.time()
+            current_time = session_time_ns()
             if not waiting and not in_round and current_round < max_rounds:
                 waiting = True
-                start_wait_time = random.randint(2, 4)
+                next_trial = get_trial_index(current_block, current_round + 1)
+                start_wait_time = trial_schedule['start_wait_time'][next_trial]
                 start_time = current_time
-            elif waiting and (current_time - start_time) >= start_wait_time:
+                prepare_next_words(next_trial)
+            elif waiting and (current_time - start_time) >= start_wait_time * 1_000_000_000:
                 waiting = False
-                current_words = create_stroop_words()
+                current_words = take_next_words(next_trial)
+                if cursor_sampler is not None:
+                    drain_cursor_samples()  # Discard samples from before the onset
+                    cursor_start_box_exit_time = None
+                onset_pending = True  # Onset and round start are stamped once the words are presented
+                round_kinematics.reset(pygame.mouse.get_pos(), current_time)
                 in_round = True
                 current_round += 1
-                block_start_time = current_time
-
-        if move_targets_var.get():
-            for word in current_words:
-                word['rect'].x += word['dx']
-                word['rect'].y += word['dy']
-
-                if word['rect'].top > height or word['rect'].bottom < 0 or word['rect'].left > width or word['rect'].right < 0:
-                    if word['congruent']:
-                        missed_targets += 1
-                        print("Congruent word missed. Ending round...")
-                        missed_rounds.append(current_round)
-                        round_results.append({
-                            'round_number': current_round,
-                            'status': 'missed',
-                            'block_number': int(block),  # Add block number to each round's result
-                            'block_time': 0,
-                            'reaction_time_to_target': 0,
-                            'dwell_time': 0,
-                            'reaction_time': 0,
-                            'path_length': 0,
-                            'path_length_outside_target': 0
-                        })
-                        in_round = False
-                        current_words.clear()
-                        break
-                    else:
-                        current_words.remove(word)
-
-        pygame.draw.rect(screen, (255, 140, 0), start_box)
-        pygame.draw.rect(screen, (255, 255, 255), left_box, 5)
-        screen.blit(start_label_surface, start_label_surface.get_rect(center=start_box.center))
-        screen.blit(congruent_label_surface, congruent_label_surface.get_rect(center=left_box.center))
-
-        for word in current_words:
-            if word['congruent']:
-                round_num = current_round
-                if round_num not in congruent_word_coords:
-                    congruent_word_coords[round_num] = []
-                word_pos_cartesian = convert_to_cartesian(word['rect'].center, height)
-                congruent_word_coords[round_num].append((word_pos_cartesian[0], word_pos_cartesian[1], time.time()))
-            screen.blit(font_large.render(word['text'], True, word['color']), word['rect'].topleft)
 
-    if block_complete:
-        # Save results immediately after block completion
-        save_results()
-        save_all_coords()
-        save_congruent_coords()
+        # Advance the words by the measured frame time so their speed does not
+        # depend on the achieved frame rate
+        frame_time = time.perf_counter()
+        frame_delta = frame_time - last_frame_time
+        last_frame_time = frame_time
+
+        if in_round:
+            block_frame_count += 1
+            block_frame_time += frame_delta
+
+        if move_targets_var.get() and current_words['alive'].any():
+            current_words['x'] += current_words['dx'] * frame_delta
+            current_words['y'] += current_words['dy'] * frame_delta
+
+            left, top = get_word_rects(current_words)
+            off_screen = current_words['alive'] & ((top > height) | (top + current_words['h'] < 0) | (left > width) | (left + current_words['w'] < 0))
+            if (off_screen & current_words['congruent']).any():
+                missed_targets += 1
+                print("Congruent word missed. Ending round...")
+                end_target_segment(current_round, session_time_ns())
+                missed_rounds.append(current_round)
+                round_results.append({
+                    'round_number': current_round,
+                    'status': 'missed',
+                    'block_number': int(block),  # Add block number to each round's result
+                    'block_time': 0,
+                    'reaction_time_to_target': 0,
+                    'dwell_time': 0,
+                    'reaction_time': 0,
+                    'path_length': 0,
+                    'path_length_outside_target': 0,
+                    'peak_velocity': 0,
+                    'movement_onset': None
+                })
+                in_round = False
+                finish_round_trajectories(current_round)
+                current_words = build_word_state([])
+                # A word still being dragged belonged to the round that just ended
+                dragging = False
+                selected_word = None
+            else:
+                current_words['alive'] &= ~off_screen
 
+    # Keep the metrics displayed even after block completion, re-rendering
+    # them only when one of the counters changes
+    metrics_key = (current_round, max_rounds, correct_responses, incorrect_responses, missed_targets)
+    metrics_changed = metrics_key != previous_metrics_key
+    if metrics_changed:
+        success_rate = ((max_rounds - missed_targets) / max_rounds) * 100
+        metrics_text = [
+            f"Rounds: {current_round}/{max_rounds}",
+            f"Correct: {correct_responses}",
+            f"Incorrect: {incorrect_responses}",
+            f"Missed: {missed_targets}",
+            f"Success Rate: {success_rate:.2f}%"
+        ]
+        metrics_surfaces, metrics_rects = render_metrics(metrics_text)
+        metrics_area = metrics_rects[0].unionall(metrics_rects[1:])
+
+    # Rebuild the static layer whenever the window or the screen state changes
+    static_layer_key = (screen, get_window_size(), show_instructions, block_complete)
+    full_redraw = not use_dirty_rects or renderer is not None or block_complete or static_layer_key != previous_static_layer_key
+    if static_layer_key != previous_static_layer_key:
+        background = draw_static_layer()
+        previous_static_layer_key = static_layer_key
+
+    screen_rect = pygame.Rect((0, 0), get_window_size())
+    if full_redraw:
+        draw_surface(background, (0, 0))
+        dirty_rects = []
+    else:
+        # Only restore the background where words and metrics were drawn last frame
+        erase_rects = previous_word_rects + [previous_metrics_area.union(metrics_area)]
+        for rect in erase_rects:
+            screen.blit(background, rect, rect)
+        dirty_rects = list(previous_word_rects)
+        if metrics_changed:
+            dirty_rects.append(previous_metrics_area.union(metrics_area))
+
+    word_rects = []
+    if not block_complete:
+        left, top = get_word_rects(current_words)
+        for i in np.flatnonzero(current_words['alive']):
+            word_rect = pygame.Rect(left[i], top[i], current_words['w'][i], current_words['h'][i])
+            draw_surface(current_words['surface'][i], word_rect)
+            word_rect = word_rect.clip(screen_rect)
+            if word_rect.width and word_rect.height:
+                word_rects.append(word_rect)
+
+    if block_complete:
         # Display "Block Complete" message
-        block_complete_surface = font_large.render("Block Complete", True, (255, 255, 255))
+        block_complete_surface = get_text_surface("Block Complete", (255, 255, 255), get_large_font_size())
         block_complete_rect = block_complete_surface.get_rect(center=(start_box.centerx, start_box.centery - 100))
-        screen.blit(block_complete_surface, block_complete_rect)
+        draw_surface(block_complete_surface, block_complete_rect)
 
         # Update the button text based on whether it's the last block
         if current_block < total_blocks:
@@ -811,33 +2044,44 @@ while running:
             button_text = "End Game"
 
         # Draw the button
-        draw_button(screen, button_text, button_rect, button_color, button_hover_color)
+        draw_button(button_text, button_rect, button_color, button_hover_color)
 
     else:
         # Check if all rounds have been completed before setting block_complete to True
         if current_round >= max_rounds:
             # Ensure that the final round has been fully processed before completing the block
             if not in_round:  # in_round is False when the current round has been processed
-                block_complete = True
-
-    # Keep the metrics displayed even after block completion
-    success_rate = ((max_rounds - missed_targets) / max_rounds) * 100
-    metrics_text = [
-        f"Rounds: {current_round}/{max_rounds}",
-        f"Correct: {correct_responses}",
-        f"Incorrect: {incorrect_responses}",
-        f"Missed: {missed_targets}",
-        f"Success Rate: {success_rate:.2f}%"
-    ]
-    for idx, text in enumerate(metrics_text):
-        metrics_surface = font_small.render(text, True, (255, 255, 255))
-        screen.blit(metrics_surface, (10, 10 + idx * 20))
-
-    pygame.display.flip()
-    clock.tick(fps)
+                complete_block()
+
+    for surface, rect in zip(metrics_surfaces, metrics_rects):
+        draw_surface(surface, rect)
+
+    dirty_rects.extend(word_rects)
+    previous_word_rects = word_rects
+    previous_metrics_area = metrics_area
+    previous_metrics_key = metrics_key
+
+    present_frame(None if full_redraw else dirty_rects)
+    # Stamp the frame once it has been handed to the display (after the
+    # vertical blank with vsync), so onset and the target trajectory are timed
+    # to when the words were shown rather than to when they were drawn
+    frame_presented_time = session_time_ns()
+    if onset_pending:
+        target_words_appear_time = frame_presented_time
+        block_start_time = frame_presented_time
+        onset_pending = False
+        for i in np.flatnonzero(current_words['congruent']):
+            start_target_segment(current_round, i, frame_presented_time)
+
+    if real_time_mode and gc_paused != in_round:
+        set_gc_paused(in_round)
+        gc_paused = in_round
+
+    wait_for_next_frame()
 
 print("Game Over. Saving Results...")
-save_results()
-save_all_coords()
-save_congruent_coords()
+if not block_complete:
+    save_results()
+    flush_block_trajectories()
+wait_for_pending_writes()
 pygame.quit()
\ No newline at end of file
@@ -1,11 +1,88 @@
 import os
 import glob
+import json
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
 import numpy as np
 import re
 
+# Trajectories loaded from binary session containers and compressed motion
+# files, keyed by the CSV path they stand in for
+loaded_trajectories = {}
+
+def load_trajectory_container(index_path):
+    # The index lists every chunk of the container: its run, byte offset and
+    # sample count. Columns are viewed straight from a memory map of the .bin
+    # file (int32 x, int32 y, int64 time, back to back); a trajectory written
+    # in several chunks is joined in order.
+    container = np.memmap(index_path.replace('_index.csv', '.bin'), dtype=np.uint8, mode='r')
+    index = pd.read_csv(index_path, dtype={'Segment Ends': str})
+    # If the game was restarted for the session, a run recorded by more than
+    # one launch is taken from the latest, as a rewritten CSV file would be
+    index = index[index['Launch'] == index.groupby('Name')['Launch'].transform('max')]
+    trajectories = {}
+    for name, chunks in index.groupby('Name', sort=False):
+        x, y, t, segment_ends = [], [], [], []
+        chunk_start = 0
+        for offset, samples, ends in zip(chunks['Offset (bytes)'], chunks['Samples'], chunks['Segment Ends']):
+            x.append(container[offset:offset + 4 * samples].view(np.int32))
+            y.append(container[offset + 4 * samples:offset + 8 * samples].view(np.int32))
+            t.append(container[offset + 8 * samples:offset + 16 * samples].view(np.int64))
+            # Samples after which the path jumps, listed per chunk
+            if isinstance(ends, str):
+                segment_ends.extend(chunk_start + int(end) for end in ends.split())
+            chunk_start += samples
+        x, y, t = np.concatenate(x), np.concatenate(y), np.concatenate(t)
+
+        # Velocity as in the CSV files: samples sharing a timestamp make one
+        # step, the path to the next timestamp over the time between them;
+        # 0 on the last timestamp and across a jump between segments
+        new_time = np.diff(t) != 0
+        starts = np.concatenate(([0], np.flatnonzero(new_time) + 1))
+        distance = np.hypot(np.diff(x), np.diff(y))[:starts[-1]]
+        time_diff = np.diff(t[starts]) / 1e9
+        step_velocity = np.zeros(len(starts))
+        step_velocity[:-1] = np.add.reduceat(distance, starts[:-1]) / np.where(time_diff > 0, time_diff, np.inf)
+        ends_before = np.concatenate(([0], np.cumsum(np.isin(np.arange(len(t)), segment_ends))))
+        step_velocity[:-1][ends_before[starts[1:]] != ends_before[starts[:-1]]] = 0
+        velocity = step_velocity[np.concatenate(([0], np.cumsum(new_time)))]
+
+        data = pd.DataFrame({'X': x, 'Y': y, 'Time (ns)': t, 'Velocity (pixels/second)': velocity})
+        box_geometry = chunks.iloc[0][['start_box_x', 'start_box_y', 'target_box_x', 'target_box_y']].to_dict()
+        trajectories[os.path.join(os.path.dirname(index_path), name + '.csv')] = (data, box_geometry)
+    return trajectories
+
+def load_motion_run(sidecar_path):
+    # A compressed motion file has no header; its JSON sidecar names the
+    # columns and holds the run's block, round, settings and box geometry
+    with open(sidecar_path) as file:
+        sidecar = json.load(file)
+    data = pd.read_csv(sidecar_path.replace('.json', '.tsv.gz'), sep='\t', header=None, names=sidecar['Columns'])
+    box_geometry = {'start_box_x': sidecar['StartBox'][0], 'start_box_y': sidecar['StartBox'][1],
+                    'target_box_x': sidecar['TargetBox'][0], 'target_box_y': sidecar['TargetBox'][1]}
+    name = f"hand-{sidecar['Hand']}_block-{sidecar['Block']}_round-{sidecar['Round']}_level-{sidecar.get('DifficultyLevel', 'advanced')}_{sidecar['Phase']}.csv"
+    return os.path.join(os.path.dirname(sidecar_path), name), (data, box_geometry)
+
+def read_trajectory(file_path):
+    if file_path in loaded_trajectories:
+        return loaded_trajectories[file_path]
+
+    # Box geometry is stored once, as name=value pairs in '#' lines above the column header
+    box_geometry = {}
+    with open(file_path) as file:
+        for line in file:
+            if not line.startswith('#'):
+                break
+            for item in line[1:].split(','):
+                key, value = item.split('=')
+                box_geometry[key.strip()] = float(value)
+    data = pd.read_csv(file_path, comment='#')
+    if not box_geometry and data.shape[1] > 7:
+        # Files from earlier versions repeat the geometry in columns 4-7 of every row
+        box_geometry = dict(zip(['start_box_x', 'start_box_y', 'target_box_x', 'target_box_y'], data.iloc[0, 4:8]))
+    return data, box_geometry
+
 def plot_combined_data(group_files, output_directory, group_name, show_axes=True, show_grid=True, show_legend=True):
     # Initialize a figure for combined path plotting
     plt.figure(figsize=(15, 7))
@@ -33,22 +110,22 @@ def plot_combined_data(group_files, output_directory, group_name, show_axes=True
 
     for idx, file_path in enumerate(group_files):
         # Load the data from CSV
-        data = pd.read_csv(file_path)
+        data, box_geometry = read_trajectory(file_path)
 
-        # Ensure the required columns exist
-        if data.shape[1] > 7:
+        # Ensure the box geometry exists
+        if box_geometry:
             x = data.iloc[:, 0]
             y = data.iloc[:, 1]
             velocity = data.iloc[:, 3]
             all_x.extend(x)
             all_y.extend(y)
             
-            # Get start and target box coordinates from the first row of the file
+            # Get start and target box coordinates from the file
             if start_box_coords is None and target_box_coords is None:
-                start_box_coords = (data.iloc[0, 4], data.iloc[0, 5])
-                target_box_coords = (data.iloc[0, 6], data.iloc[0, 7])
+                start_box_coords = (box_geometry['start_box_x'], box_geometry['start_box_y'])
+                target_box_coords = (box_geometry['target_box_x'], box_geometry['target_box_y'])
         else:
-            print(f"File {file_path} does not have enough columns.")
+            print(f"File {file_path} does not have the box geometry.")
             continue
 
     if not all_x or not all_y:
@@ -78,9 +155,9 @@ def plot_combined_data(group_files, output_directory, group_name, show_axes=True
 
     for idx, file_path in enumerate(group_files):
         # Load the data from CSV
-        data = pd.read_csv(file_path)
+        data, box_geometry = read_trajectory(file_path)
 
-        if data.shape[1] <= 7:
+        if not box_geometry:
             continue
 
         # Assuming the columns by index as earlier explained
@@ -158,9 +235,9 @@ def plot_combined_data(group_files, output_directory, group_name, show_axes=True
     # Plot Velocity for each file
     for file_path in group_files:
         # Load the data from CSV
-        data = pd.read_csv(file_path)
+        data, box_geometry = read_trajectory(file_path)
 
-        if data.shape[1] <= 7:
+        if not box_geometry:
             continue
 
         velocity = data.iloc[:, 3]
@@ -199,6 +276,19 @@ for directory in sub_dirs:
 
     # Collect all CSV files in the directory
     csv_files = glob.glob(os.path.join(directory, '*.csv'))
+
+    # Add the trajectories of any binary session containers
+    for index_path in glob.glob(os.path.join(directory, '*_trajectories_index.csv')):
+        csv_files.remove(index_path)
+        trajectories = load_trajectory_container(index_path)
+        loaded_trajectories.update(trajectories)
+        csv_files.extend(trajectories)
+
+    # And of any compressed motion files
+    for sidecar_path in glob.glob(os.path.join(directory, '*_motion.json')):
+        file_path, trajectory = load_motion_run(sidecar_path)
+        loaded_trajectories[file_path] = trajectory
+        csv_files.append(file_path)
     
     # Group files by round and level
     groups = {}